@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -9,12 +10,25 @@ from fastapi import Depends, Query
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from api.errors import ApiException
+from core.cache import TTLCache
 from core.config import get_settings
 from core.db import get_db
+from core.utils import hash_token
 
 
 security = HTTPBearer(auto_error=False)
 
+# Verified token claims (token hash -> wallet) and user documents (wallet -> doc).
+# Both are per-process; writers call invalidate_user() and the TTL bounds
+# staleness across workers.
+_CACHE_SIZE = 4096
+_claims_cache = TTLCache(_CACHE_SIZE, ttl_seconds=300)
+_user_cache = TTLCache(_CACHE_SIZE, ttl_seconds=get_settings().user_cache_ttl_seconds)
+
+
+def invalidate_user(wallet_address: str) -> None:
+    _user_cache.pop(wallet_address)
+
 
 def create_access_token(wallet_address: str) -> str:
     settings = get_settings()
@@ -24,6 +38,10 @@ def create_access_token(wallet_address: str) -> str:
 
 
 def decode_token(token: str) -> str:
+    cache_key = hash_token(token)
+    cached = _claims_cache.get(cache_key)
+    if cached:
+        return cached
     settings = get_settings()
     try:
         payload = jwt.decode(token, settings.jwt_secret, algorithms=["HS256"])
@@ -32,6 +50,8 @@ def decode_token(token: str) -> str:
     wallet_address = payload.get("sub")
     if not wallet_address:
         raise ApiException(status_code=401, code="AUTH_INVALID", message="Invalid token payload")
+    expires_at = payload.get("exp")
+    _claims_cache.set(cache_key, wallet_address, expires_at - time.time() if expires_at else None)
     return wallet_address
 
 
@@ -47,11 +67,19 @@ async def get_current_user(
     # Telegram Mini Apps can open download links in an external browser without
     # losing auth context. Both paths go through the same decode_token check.
     raw_token = credentials.credentials if credentials else token
+    return await user_from_token(raw_token)
+
+
+async def user_from_token(raw_token: Optional[str]) -> dict:
+    """Resolve a raw JWT to its user document; also used where no request headers exist (WebSocket)."""
     if not raw_token:
         raise ApiException(status_code=401, code="AUTH_REQUIRED", message="Authentication required")
     wallet_address = decode_token(raw_token)
-    db = get_db()
-    user = await db.users.find_one({"wallet_address": wallet_address})
-    if not user:
-        raise ApiException(status_code=401, code="AUTH_INVALID", message="User not found")
-    return user
+    user = _user_cache.get(wallet_address)
+    if user is None:
+        db = get_db()
+        user = await db.users.find_one({"wallet_address": wallet_address})
+        if not user:
+            raise ApiException(status_code=401, code="AUTH_INVALID", message="User not found")
+        _user_cache.set(wallet_address, user)
+    return dict(user)
@@ -4,3 +4,11 @@ from fastapi import HTTPException
 class ApiException(HTTPException):
     def __init__(self, status_code: int, code: str, message: str) -> None:
         super().__init__(status_code=status_code, detail={"code": code, "message": message})
+
+
+class NotModified(Exception):
+    """Raised by conditional GETs; answered with an empty `304` carrying `etag`."""
+
+    def __init__(self, etag: str) -> None:
+        super().__init__(etag)
+        self.etag = etag
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import defaultdict, deque
+from typing import Any, Optional
+
+from pymongo import CursorType
+from pymongo.errors import PyMongoError
+
+from core.db import get_db
+from core.sequences import current_seq
+from core.stream import (
+    STREAM_COLLECTION,
+    append_stream_events,
+    ensure_stream_collection,
+    shared_stream,
+    stream_message,
+)
+
+log = logging.getLogger(__name__)
+
+_QUEUE_SIZE = 100
+
+
+class StreamHub:
+    """Per-wallet fan-out to the `/stream` clients connected to this process.
+
+    Every client gets a bounded queue; when a slow client's queue is full the
+    oldest message is dropped, so one stalled connection can't grow memory.
+    """
+
+    def __init__(self, queue_size: int = _QUEUE_SIZE) -> None:
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+
+    def subscribe(self, wallet_address: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[wallet_address].add(queue)
+        return queue
+
+    def unsubscribe(self, wallet_address: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(wallet_address)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[wallet_address]
+
+    def deliver(self, wallet_address: str, message: dict) -> None:
+        for queue in self._subscribers.get(wallet_address, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+
+hub = StreamHub()
+
+_relay_task: Optional[asyncio.Task] = None
+# How far behind the last delivered `seq` a reopened cursor starts, to pick up
+# events that reserved their number earlier but landed later; see core.sequences.
+_RESUME_OVERLAP = 1000
+
+
+async def publish(events: list[tuple[str, str, Any]]) -> None:
+    """Push `(wallet, type, data)` events to the wallets' connected clients.
+
+    With `STREAM_BACKEND=mongo` events go through a capped collection that every
+    API worker tails, so clients receive them whichever worker they are on.
+    """
+    if not events:
+        return
+    if shared_stream():
+        await append_stream_events(events)
+        return
+    for wallet, event_type, data in events:
+        hub.deliver(wallet, stream_message(event_type, data))
+
+
+async def _relay() -> None:
+    """Tail the capped stream collection and deliver new events to local clients."""
+    db = get_db()
+    await ensure_stream_collection(db)
+    # Clients only exist from now on, so skip everything already published.
+    start_seq = last_seq = await current_seq(STREAM_COLLECTION)
+    seen: deque[int] = deque(maxlen=_RESUME_OVERLAP)
+    seen_set: set[int] = set()
+    while True:
+        floor = max(start_seq, last_seq - _RESUME_OVERLAP)
+        cursor = db[STREAM_COLLECTION].find(
+            {"seq": {"$gt": floor}}, cursor_type=CursorType.TAILABLE_AWAIT
+        )
+        try:
+            # `async for` ends on every empty await period while the cursor stays
+            # open on the server, so keep iterating the same cursor until it dies.
+            while cursor.alive:
+                async for doc in cursor:
+                    seq = doc["seq"]
+                    if seq in seen_set:
+                        continue
+                    if len(seen) == seen.maxlen:
+                        seen_set.discard(seen[0])
+                    seen.append(seq)
+                    seen_set.add(seq)
+                    last_seq = max(last_seq, seq)
+                    hub.deliver(doc["wallet_address"], doc["message"])
+        except asyncio.CancelledError:
+            raise
+        except PyMongoError as exc:
+            log.warning("Stream relay error, retrying: %s", exc)
+        finally:
+            await cursor.close()
+        # The cursor died (empty collection at open, or it fell off the capped
+        # collection); wait before reopening.
+        await asyncio.sleep(1)
+
+
+def start_relay() -> None:
+    global _relay_task
+    if shared_stream() and _relay_task is None:
+        _relay_task = asyncio.create_task(_relay())
+
+
+async def stop_relay() -> None:
+    global _relay_task
+    if _relay_task is not None:
+        _relay_task.cancel()
+        try:
+            await _relay_task
+        except asyncio.CancelledError:
+            pass
+        _relay_task = None
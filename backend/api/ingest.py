@@ -0,0 +1,438 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+from pymongo.results import BulkWriteResult
+
+from api.auth import invalidate_user
+from api.errors import ApiException
+from api.hub import publish
+from api.schemas import InternalEvent
+from api.services import format_doc, log_doc
+from api.telegram import notify_wallet
+from core.cache import TTLCache
+from core.db import get_db
+from core.notifications import add_unread, notification_doc
+from core.rollups import bucket_filters, merge_increments, rollup_increments, rollup_update
+from core.utils import now_utc, parse_timestamp
+from core.versions import bump_versions
+
+log = logging.getLogger(__name__)
+
+# Collections whose write order matters within a batch (later events win).
+_ORDERED_COLLECTIONS = {"bot_state"}
+
+# Size of the per-wallet `latest_opportunities` view served by /market/opportunities.
+LATEST_OPPORTUNITIES = 4
+
+# Used when a wallet has no `opportunity_alert_window_sec` setting.
+DEFAULT_ALERT_WINDOW_SEC = 300
+
+# wallet -> opportunity alert window; PUT /settings invalidates its wallet.
+_alert_windows = TTLCache(4096, ttl_seconds=60)
+
+
+def build_op(wallet: str, data: dict) -> dict:
+    return {
+        "wallet_address": wallet,
+        "timestamp": parse_timestamp(data.get("timestamp")),
+        "pair": data.get("pair", ""),
+        "dex": data.get("dex", ""),
+        "profit": float(data.get("profit", 0)),
+        "fees": float(data.get("fees", 0)),
+        "exec_time_ms": int(data.get("exec_time_ms", 0)),
+        "status": data.get("status", "success"),
+        "error_message": data.get("error_message"),
+    }
+
+
+def build_opportunity(wallet: str, data: dict) -> dict:
+    return {
+        "wallet_address": wallet,
+        "pair": data.get("pair", ""),
+        "buy_dex": data.get("buy_dex", ""),
+        "sell_dex": data.get("sell_dex", ""),
+        "expected_profit_pct": float(data.get("expected_profit_pct", 0)),
+        "liquidity_score": float(data.get("liquidity_score", 0)),
+        "gas_price_gwei": float(data.get("gas_price_gwei", 0)),
+        "timestamp": parse_timestamp(data.get("timestamp")),
+    }
+
+
+def opportunity_message(data: dict) -> str:
+    return (
+        f"<b>Arbitrage opportunity</b>\n"
+        f"Pair: <b>{data.get('pair', '--')}</b>\n"
+        f"Buy on: {data.get('buy_dex', '--')}\n"
+        f"Sell on: {data.get('sell_dex', '--')}\n"
+        f"Expected profit: <b>{float(data.get('expected_profit_pct', 0)):.2f}%</b>\n"
+        f"Gas: {float(data.get('gas_price_gwei', 0)):.1f} Gwei"
+    )
+
+
+def invalidate_alert_window(wallet_address: str) -> None:
+    _alert_windows.pop(wallet_address)
+
+
+async def alert_windows(wallets: set[str]) -> dict[str, int]:
+    """Opportunity alert window (seconds) per wallet, from the users' settings."""
+    windows = {wallet: _alert_windows.get(wallet) for wallet in wallets}
+    missing = [wallet for wallet, window in windows.items() if window is None]
+    if missing:
+        db = get_db()
+        cursor = db.settings.find(
+            {"wallet_address": {"$in": missing}},
+            {"_id": 0, "wallet_address": 1, "opportunity_alert_window_sec": 1},
+        )
+        found = {doc["wallet_address"]: doc async for doc in cursor}
+        for wallet in missing:
+            window = found.get(wallet, {}).get("opportunity_alert_window_sec", DEFAULT_ALERT_WINDOW_SEC)
+            windows[wallet] = window
+            _alert_windows.set(wallet, window)
+    return windows
+
+
+async def _close_alert_windows(db, groups: list[dict], now: datetime) -> None:
+    """Clear `window_open` on the groups' windows that have run out."""
+    await db.notifications.update_many(
+        {
+            "$or": [{"wallet_address": g["doc"]["wallet_address"], "group_key": g["key"]} for g in groups],
+            "window_open": True,
+            "coalesce_until": {"$lte": now},
+        },
+        {"$unset": {"window_open": ""}},
+    )
+
+
+def _alert_update(group: dict, now: datetime) -> UpdateOne:
+    """Fold a route's alerts into its open notification, opening a new window if none is open.
+
+    The notification is keyed by `group_key` (pair and route); repeats bump its
+    `count`, `best_profit_pct` and `created_at` so it resurfaces at the top of the feed.
+    At most one window per route is open (a partial unique index on `window_open`),
+    and the filter matches that index exactly, so the server retries an upsert
+    that loses a race as an update instead of opening a second window.
+    """
+    doc = group["doc"]
+    on_insert = {k: v for k, v in doc.items() if k not in ("wallet_address", "created_at")}
+    on_insert["coalesce_until"] = now + timedelta(seconds=group["window"])
+    return UpdateOne(
+        {"wallet_address": doc["wallet_address"], "group_key": group["key"], "window_open": True},
+        {
+            "$setOnInsert": on_insert,
+            "$set": {"created_at": now},
+            "$inc": {"count": group["count"]},
+            "$max": {"best_profit_pct": group["best"]},
+        },
+        upsert=True,
+    )
+
+
+def _user_kpi_update(profit: float, deals: int) -> list[dict]:
+    """Pipeline update adding `deals` successful trades worth `profit` to the user's KPIs."""
+    total_profit = {"$add": [{"$ifNull": ["$total_profit", 0.0]}, profit]}
+    successful = {"$add": [{"$ifNull": ["$successful_arbs", 0]}, deals]}
+    return [
+        {"$set": {"total_profit": total_profit, "successful_arbs": successful}},
+        {
+            "$set": {
+                "avg_profitability": {
+                    "$cond": [
+                        {"$gt": ["$successful_arbs", 0]},
+                        {"$divide": ["$total_profit", "$successful_arbs"]},
+                        0.0,
+                    ]
+                }
+            }
+        },
+    ]
+
+
+def _latest_opportunities_update(items: list[dict]) -> dict:
+    """Push new opportunities into a wallet's view, keeping only the newest few."""
+    return {
+        "$push": {
+            "items": {
+                "$each": items,
+                "$sort": {"timestamp": -1},
+                "$slice": LATEST_OPPORTUNITIES,
+            }
+        },
+        "$set": {"updated_at": now_utc()},
+    }
+
+
+@dataclass
+class _PendingEvent:
+    wallet: str
+    collection: str
+    write: Any
+    notifications: list[dict] = field(default_factory=list)
+    op: Optional[dict] = None
+    opportunity: Optional[dict] = None
+    # Opportunity notification and Telegram text, subject to per-route coalescing.
+    alert: Optional[tuple[dict, str]] = None
+    telegram: list[str] = field(default_factory=list)
+    # (type, data) pushed to the wallet's /stream clients once the primary write lands.
+    stream: list[tuple[str, Any]] = field(default_factory=list)
+
+
+class EventBatch:
+    """Collects the Mongo writes for a group of monitor events.
+
+    Writes are grouped per collection so that N events cost one round-trip per
+    collection rather than 3-4 per event. Each event has a single primary write
+    (the op, log, opportunity, notification or status row); follow-ups such as
+    KPI updates, derived notifications, stream events and Telegram messages only
+    run for events whose primary write succeeded; Telegram messages are only
+    queued here and delivered in the background (see api.telegram). Failures of follow-ups are logged but do not
+    fail the event, so retrying a failed event never duplicates a stored row.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[int, _PendingEvent] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, index: int, event: InternalEvent) -> None:
+        wallet = event.wallet_address.lower()
+        data = event.payload
+
+        if event.type == "op":
+            op = build_op(wallet, data)
+            pending = _PendingEvent(wallet, "ops", InsertOne(op), op=op)
+            if op["status"] == "success":
+                pending.notifications.append(
+                    notification_doc(wallet, "deal", "Deal completed", f"Profit {op['profit']}")
+                )
+                pending.telegram.append(f"Deal completed: {op['pair']} profit {op['profit']}")
+
+        elif event.type == "log":
+            doc = log_doc(wallet, data.get("level", "info"), data.get("message", ""), data.get("context"))
+            pending = _PendingEvent(wallet, "logs", InsertOne(doc))
+            pending.stream.append(("log", doc))
+
+        elif event.type == "notification":
+            title = data.get("title", "Update")
+            message = data.get("message", "")
+            doc = notification_doc(wallet, data.get("type", "info"), title, message)
+            pending = _PendingEvent(wallet, "notifications", InsertOne(doc))
+            pending.stream.append(("notification", doc))
+            pending.telegram.append(f"{title}: {message}")
+
+        elif event.type == "opportunity":
+            opportunity = build_opportunity(wallet, data)
+            pending = _PendingEvent(wallet, "opportunities", InsertOne(opportunity), opportunity=opportunity)
+            pending.stream.append(("opportunity", opportunity))
+            doc = notification_doc(
+                wallet,
+                "opportunity",
+                data.get("title", "Opportunity found"),
+                data.get("message", "New route detected"),
+            )
+            pending.alert = (doc, opportunity_message(data))
+
+        elif event.type == "status":
+            last_error = data.get("last_error")
+            pending = _PendingEvent(
+                wallet,
+                "bot_state",
+                UpdateOne(
+                    {"wallet_address": wallet},
+                    {
+                        "$set": {
+                            "status": data.get("status", "error"),
+                            "last_error": last_error,
+                            "last_change_at": now_utc(),
+                        }
+                    },
+                    upsert=True,
+                ),
+            )
+            pending.stream.append(("status", {"status": data.get("status", "error"), "last_error": last_error}))
+            if last_error:
+                pending.notifications.append(notification_doc(wallet, "error", "Critical error", last_error))
+                pending.telegram.append(f"Critical error: {last_error}")
+
+        else:
+            raise ApiException(status_code=400, code="EVENT_INVALID", message="Unknown event type")
+
+        self._pending[index] = pending
+
+    async def flush(self) -> dict[int, str]:
+        """Write all collected events. Returns `{index: error message}` for failed events."""
+        db = get_db()
+        errors: dict[int, str] = {}
+
+        primary: dict[str, list[tuple[int, Any]]] = defaultdict(list)
+        for index, pending in self._pending.items():
+            primary[pending.collection].append((index, pending.write))
+        await asyncio.gather(*(_bulk_write(db, name, items, errors) for name, items in primary.items()))
+
+        done = [pending for index, pending in self._pending.items() if index not in errors]
+        alerts = await self._group_alerts(done)
+        derived = [(i, doc) for i, p in enumerate(done) for doc in p.notifications]
+        kpis: dict[str, list[float]] = defaultdict(list)
+        rollups: dict[str, dict] = defaultdict(dict)
+        buckets: dict[tuple, tuple[dict, dict]] = {}
+        latest: dict[str, list[dict]] = defaultdict(list)
+        for pending in done:
+            if pending.opportunity is not None:
+                latest[pending.wallet].append({k: v for k, v in pending.opportunity.items() if k != "_id"})
+            if pending.op is None:
+                continue
+            if pending.op["status"] == "success":
+                kpis[pending.wallet].append(pending.op["profit"])
+            inc = rollup_increments(pending.op)
+            merge_increments(rollups[pending.wallet], inc)
+            for key in bucket_filters(pending.op):
+                _, bucket_inc = buckets.setdefault(tuple(key.values()), (key, {}))
+                merge_increments(bucket_inc, inc)
+        kpi_writes = [
+            (i, UpdateOne({"wallet_address": wallet}, _user_kpi_update(sum(profits), len(profits)), upsert=True))
+            for i, (wallet, profits) in enumerate(kpis.items())
+        ]
+        rollup_writes = [
+            (i, UpdateOne({"wallet_address": wallet}, rollup_update(inc), upsert=True))
+            for i, (wallet, inc) in enumerate(rollups.items())
+        ]
+        bucket_writes = [
+            (i, UpdateOne(key, rollup_update(inc), upsert=True))
+            for i, (key, inc) in enumerate(buckets.values())
+        ]
+        latest_writes = [
+            (i, UpdateOne({"_id": wallet}, _latest_opportunities_update(items), upsert=True))
+            for i, (wallet, items) in enumerate(latest.items())
+        ]
+        alert_writes = []
+        if alerts:
+            now = now_utc()
+            try:
+                await _close_alert_windows(db, alerts, now)
+            except PyMongoError as exc:
+                log.warning("Closing alert windows failed: %s", exc)
+            alert_writes = [(i, _alert_update(group, now)) for i, group in enumerate(alerts)]
+        follow_ups = {
+            "notifications": [(i, InsertOne(doc)) for i, doc in derived],
+            "alerts": alert_writes,
+            "users": kpi_writes,
+            "op_rollups": rollup_writes,
+            "op_buckets": bucket_writes,
+            "latest_opportunities": latest_writes,
+        }
+        follow_up_errors: dict[str, dict[int, str]] = {name: {} for name in follow_ups}
+        results = await asyncio.gather(
+            *(
+                _bulk_write(db, "notifications" if name == "alerts" else name, items, follow_up_errors[name])
+                for name, items in follow_ups.items()
+            )
+        )
+        alert_result = results[list(follow_ups).index("alerts")]
+        for wallet in kpis:
+            invalidate_user(wallet)
+        failed = sorted({msg for errs in follow_up_errors.values() for msg in errs.values()})
+        if failed:
+            log.warning("Event follow-up writes failed: %s", failed)
+
+        stream = [(p.wallet, etype, _stream_data(data)) for p in done for etype, data in p.stream]
+        stream += [
+            (done[i].wallet, "notification", format_doc(doc))
+            for i, doc in derived
+            if i not in follow_up_errors["notifications"]
+        ]
+        # Only an alert that opened a new window is pushed and sent to Telegram;
+        # repeats just update the stored notification.
+        for i, _id in (alert_result.upserted_ids if alert_result else {}).items():
+            group = alerts[i]
+            doc = {**group["doc"], "_id": _id, "count": group["count"], "best_profit_pct": group["best"]}
+            stream.append((doc["wallet_address"], "notification", format_doc(doc)))
+            notify_wallet(doc["wallet_address"], group["text"])
+        stream += [
+            (wallet, "kpis", {"current_profit": inc["total_profit"], "completed_deals": inc["success_count"]})
+            for i, (wallet, inc) in enumerate(rollups.items())
+            if inc["success_count"] and i not in follow_up_errors["op_rollups"]
+        ]
+        unread: dict[str, int] = defaultdict(int)
+        for pending in done:
+            if pending.collection == "notifications":
+                unread[pending.wallet] += 1
+        for i, _ in follow_ups["notifications"]:
+            if i not in follow_up_errors["notifications"]:
+                unread[done[i].wallet] += 1
+        for i in (alert_result.upserted_ids if alert_result else {}):
+            unread[alerts[i]["doc"]["wallet_address"]] += 1
+        try:
+            await add_unread(unread)
+        except PyMongoError as exc:
+            log.warning("Unread counter update failed: %s", exc)
+        await bump_versions(p.wallet for p in done)
+        await publish(stream)
+
+        for pending in done:
+            for text in pending.telegram:
+                notify_wallet(pending.wallet, text)
+
+        return errors
+
+    async def _group_alerts(self, done: list[_PendingEvent]) -> list[dict]:
+        """Merge the batch's opportunity alerts per route for wallets with an alert window.
+
+        Wallets with the window disabled get a plain notification and Telegram
+        message per event instead.
+        """
+        with_alerts = [pending for pending in done if pending.alert is not None]
+        if not with_alerts:
+            return []
+        windows = await alert_windows({pending.wallet for pending in with_alerts})
+        groups: dict[str, dict] = {}
+        for pending in with_alerts:
+            doc, text = pending.alert
+            window = windows[pending.wallet]
+            if not window:
+                pending.notifications.append(doc)
+                pending.telegram.append(text)
+                continue
+            opportunity = pending.opportunity
+            key = f"opportunity:{opportunity['pair']}:{opportunity['buy_dex']}:{opportunity['sell_dex']}"
+            group = groups.setdefault(
+                f"{pending.wallet}|{key}",
+                {"key": key, "doc": doc, "text": text, "window": window, "count": 0, "best": float("-inf")},
+            )
+            group["count"] += 1
+            group["best"] = max(group["best"], opportunity["expected_profit_pct"])
+        return list(groups.values())
+
+
+def _stream_data(data: Any) -> Any:
+    return format_doc(data) if isinstance(data, dict) and "_id" in data else data
+
+
+async def _bulk_write(
+    db, name: str, items: list[tuple[int, Any]], errors: dict[int, str]
+) -> Optional[BulkWriteResult]:
+    """Run one `bulk_write` for `items` and record failures by event index."""
+    if not items:
+        return None
+    ordered = name in _ORDERED_COLLECTIONS
+    try:
+        return await db[name].bulk_write([write for _, write in items], ordered=ordered)
+    except BulkWriteError as exc:
+        write_errors = exc.details.get("writeErrors", [])
+        for err in write_errors:
+            errors[items[err["index"]][0]] = err.get("errmsg", "Write failed")
+        if ordered and write_errors:
+            # An ordered bulk write stops at the first error; the rest never ran.
+            first = min(err["index"] for err in write_errors)
+            for index, _ in items[first + 1:]:
+                errors.setdefault(index, "Not applied after an earlier failure")
+    except PyMongoError as exc:
+        for index, _ in items:
+            errors[index] = str(exc)
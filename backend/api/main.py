@@ -5,15 +5,19 @@ import logging
 from fastapi import Depends, FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from api.errors import ApiException
+from api.errors import ApiException, NotModified
+from api.hub import start_relay, stop_relay
 from api.ratelimit import rate_limiter
 from api.responses import error
-from api.routers import auth, bot, deploy, internal, logs, market, notifications, profile, reports, settings
+from api.routers import auth, bot, deploy, internal, logs, market, notifications, profile, reports, settings, stream
+from api.telegram import dispatcher
+from core.chain import warm_up
 from core.config import get_settings
-from core.db import init_indexes
+from core.db import audit_indexes, init_indexes
+from core.rollups import start_backfill
 
 app = FastAPI(
     title="ØNE-ARB API",
@@ -36,12 +40,18 @@ app = FastAPI(
         {"name": "market",        "description": "Live arbitrage opportunities detected by the monitor."},
         {"name": "notifications", "description": "In-app notifications feed."},
         {"name": "logs",          "description": "Structured bot execution logs."},
+        {"name": "stream",        "description": "Live push of bot status, KPIs and feeds (SSE / WebSocket)."},
         {"name": "deploy",        "description": "One-click smart contract deployment."},
         {"name": "internal",      "description": "Internal endpoints used by the DEX monitor service (X-Internal-Key required)."},
     ],
 )
 
 settings_env = get_settings()
+
+# Telegram bot webhook served by the API replicas instead of a separate bot process.
+telegram_webhook = None
+if settings_env.bot_webhook_url and settings_env.bot_webhook_in_api:
+    from bot import webhook as telegram_webhook
 origins = [origin.strip() for origin in settings_env.cors_origins.split(",") if origin.strip()]
 
 app.add_middleware(
@@ -60,6 +70,22 @@ app.add_middleware(
 async def startup() -> None:
     logging.basicConfig(level=logging.INFO)
     await init_indexes()
+    if settings_env.index_audit:
+        await audit_indexes()
+    start_backfill()
+    start_relay()
+    dispatcher.start()
+    warm_up(settings_env.deploy_rpc_url)
+    if telegram_webhook is not None:
+        await telegram_webhook.register_webhook()
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    await stop_relay()
+    await dispatcher.stop()
+    if telegram_webhook is not None:
+        await telegram_webhook.close_webhook()
 
 
 @app.exception_handler(ApiException)
@@ -67,6 +93,14 @@ async def api_exception_handler(request: Request, exc: ApiException):
     return JSONResponse(status_code=exc.status_code, content=error(exc.detail["code"], exc.detail["message"]))
 
 
+@app.exception_handler(NotModified)
+async def not_modified_handler(request: Request, exc: NotModified):
+    return Response(
+        status_code=304,
+        headers={"ETag": exc.etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"},
+    )
+
+
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     if isinstance(exc.detail, dict) and "code" in exc.detail:
@@ -91,3 +125,7 @@ app.include_router(notifications.router, dependencies=[rate_limit])
 app.include_router(logs.router, dependencies=[rate_limit])
 app.include_router(deploy.router, dependencies=[rate_limit])
 app.include_router(internal.router, dependencies=[rate_limit])
+# Rate limited per route inside the router: a long-lived connection counts once.
+app.include_router(stream.router)
+if telegram_webhook is not None:
+    app.include_router(telegram_webhook.router)
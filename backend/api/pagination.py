@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+from typing import Optional, Sequence
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from api.errors import ApiException
+from api.services import format_doc
+from core.utils import as_utc, parse_timestamp
+
+
+def encode_cursor(doc: dict, sort_field: str) -> str:
+    raw = f"{parse_timestamp(doc[sort_field]).isoformat()}|{doc['_id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, ObjectId]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        ts, oid = raw.split("|", 1)
+        return as_utc(datetime.fromisoformat(ts)), ObjectId(oid)
+    except (ValueError, InvalidId) as exc:
+        raise ApiException(status_code=400, code="CURSOR_INVALID", message="Invalid pagination cursor") from exc
+
+
+async def keyset_page(
+    collection,
+    query: dict,
+    sort_field: str,
+    limit: int,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    union: Sequence[str] = (),
+) -> tuple[list[dict], Optional[str]]:
+    """Fetch one newest-first page ordered by `(sort_field, _id)`.
+
+    `before` returns items older than the cursor, `after` items newer than it;
+    either way the page is returned newest first. `next_cursor` continues in
+    the requested direction and is `None` once a page comes back short.
+    Collections named in `union` (same shape, e.g. op archives) are paged
+    together with `collection`; each contributes at most `limit` rows.
+    """
+    if before and after:
+        raise ApiException(status_code=400, code="CURSOR_INVALID", message="Use either before or after, not both")
+
+    direction = -1
+    cursor_value = before or after
+    if cursor_value:
+        ts, oid = decode_cursor(cursor_value)
+        op = "$lt" if before else "$gt"
+        direction = -1 if before else 1
+        keyset = {"$or": [{sort_field: {op: ts}}, {sort_field: ts, "_id": {op: oid}}]}
+        query = {"$and": [query, keyset]}
+
+    sort = [(sort_field, direction), ("_id", direction)]
+    if union:
+        branch = [{"$match": query}, {"$sort": dict(sort)}, {"$limit": limit}]
+        pipeline = [
+            *branch,
+            *({"$unionWith": {"coll": name, "pipeline": branch}} for name in union),
+            {"$sort": dict(sort)},
+            {"$limit": limit},
+        ]
+        docs = await collection.aggregate(pipeline).to_list(length=limit)
+    else:
+        docs = await collection.find(query).sort(sort).limit(limit).to_list(length=limit)
+    next_cursor = encode_cursor(docs[-1], sort_field) if len(docs) == limit else None
+    if direction == 1:
+        docs.reverse()
+    return [format_doc(doc) for doc in docs], next_cursor
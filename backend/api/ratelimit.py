@@ -1,25 +1,199 @@
 from __future__ import annotations
 
+import logging
 import time
-from collections import defaultdict
-from typing import Callable
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional, Protocol
 
 from fastapi import Request
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
 
+from api.auth import decode_token
 from api.errors import ApiException
+from core.config import get_settings
+from core.db import get_db
 
-RATE_LIMIT_BUCKET: dict[str, list[float]] = defaultdict(list)
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """`limit` requests per `window_seconds` for routes matching `pattern`.
+
+    A pattern ending in `*` is a prefix match and its routes share one budget;
+    otherwise it must equal the route path. `limit <= 0` exempts the routes.
+    """
+
+    pattern: str
+    limit: int
+    window_seconds: int
+
+    def matches(self, path: str) -> bool:
+        if self.pattern.endswith("*"):
+            return path.startswith(self.pattern[:-1])
+        return path == self.pattern
+
+
+# The monitor talks to /internal/* from a single host, so it gets its own budget.
+DEFAULT_RULES = (RateLimitRule("/internal/*", 1200, 60),)
+
+
+def parse_rules(spec: str) -> list[RateLimitRule]:
+    """Parse `RATE_LIMITS`, e.g. `/bot/status=120/60,/export/*=10/60,/internal/*=0/60`."""
+    rules = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        pattern, _, budget = item.partition("=")
+        limit, _, window = budget.partition("/")
+        rules.append(RateLimitRule(pattern.strip(), int(limit), int(window or 60)))
+    return rules
+
+
+class RateLimitBackend(Protocol):
+    async def hit(self, key: str, limit: int, window_seconds: int) -> bool: ...
+
+
+def _estimate(prev: int, curr: int, now: float, window_seconds: int) -> float:
+    """Sliding-window-counter estimate: previous window weighted by its remaining overlap."""
+    elapsed = (now % window_seconds) / window_seconds
+    return prev * (1 - elapsed) + curr
+
+
+class MemoryRateLimitBackend:
+    """Per-process sliding window counters, O(1) per request.
+
+    Keys are kept in least-recently-used order; keys idle for two windows
+    (or beyond `max_keys`) are evicted from the front.
+    """
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        # key -> [window index, previous count, current count, last seen, window seconds]
+        self._entries: OrderedDict[str, list] = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window_seconds: int) -> bool:
+        now = time.time()
+        window = int(now // window_seconds)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = [window, 0, 0, now, window_seconds]
+            self._entries[key] = entry
+        elif entry[0] != window:
+            entry[1] = entry[2] if entry[0] == window - 1 else 0
+            entry[2] = 0
+            entry[0] = window
+        entry[3] = now
+        self._entries.move_to_end(key)
+
+        allowed = _estimate(entry[1], entry[2], now, window_seconds) < limit
+        if allowed:
+            entry[2] += 1
+        self._evict(now)
+        return allowed
+
+    def _evict(self, now: float) -> None:
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if len(self._entries) <= self.max_keys and now - entry[3] < 2 * entry[4]:
+                break
+            del self._entries[key]
+
+
+class MongoRateLimitBackend:
+    """Sliding window counters in the `rate_limits` collection, shared by all workers.
+
+    One `find_one_and_update` per request rolls the window and counts the hit;
+    a denied hit is given back. Idle keys expire via the TTL index on
+    `expires_at`. If Mongo is unavailable requests are let through.
+    """
+
+    async def hit(self, key: str, limit: int, window_seconds: int) -> bool:
+        now = time.time()
+        window = int(now // window_seconds)
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=2 * window_seconds)
+        same_window = {"$eq": ["$window", window]}
+        update = [
+            {
+                "$set": {
+                    "prev": {
+                        "$cond": [
+                            same_window,
+                            "$prev",
+                            {"$cond": [{"$eq": ["$window", window - 1]}, "$curr", 0]},
+                        ]
+                    },
+                    "curr": {"$cond": [same_window, {"$add": ["$curr", 1]}, 1]},
+                    "window": window,
+                    "expires_at": expires_at,
+                }
+            }
+        ]
+        db = get_db()
+        try:
+            doc = await db.rate_limits.find_one_and_update(
+                {"_id": key}, update, upsert=True, return_document=ReturnDocument.AFTER
+            )
+            if _estimate(doc["prev"], doc["curr"] - 1, now, window_seconds) < limit:
+                return True
+            await db.rate_limits.update_one({"_id": key, "window": window}, {"$inc": {"curr": -1}})
+            return False
+        except PyMongoError as exc:
+            log.warning("Rate limit backend unavailable, allowing request: %s", exc)
+            return True
+
+
+_backend: Optional[RateLimitBackend] = None
+_rules: Optional[list[RateLimitRule]] = None
+
+
+def get_backend() -> RateLimitBackend:
+    global _backend
+    if _backend is None:
+        if get_settings().rate_limit_backend == "mongo":
+            _backend = MongoRateLimitBackend()
+        else:
+            _backend = MemoryRateLimitBackend()
+    return _backend
+
+
+def get_rules() -> list[RateLimitRule]:
+    global _rules
+    if _rules is None:
+        # Configured rules take precedence over the defaults.
+        _rules = [*parse_rules(get_settings().rate_limits), *DEFAULT_RULES]
+    return _rules
+
+
+def _identity(request: Request) -> str:
+    """Budget owner: the authenticated wallet when a valid token is present, else the client host."""
+    header = request.headers.get("authorization", "")
+    token = header[7:] if header.lower().startswith("bearer ") else request.query_params.get("token")
+    if token:
+        try:
+            return f"wallet:{decode_token(token)}"
+        except ApiException:
+            pass
+    return f"host:{request.client.host if request.client else 'unknown'}"
 
 
 def rate_limiter(limit: int = 60, window_seconds: int = 60) -> Callable:
+    """Dependency enforcing the first matching rule, or `limit`/`window_seconds` per route."""
+
     async def _limit(request: Request) -> None:
-        client_host = request.client.host if request.client else "unknown"
-        key = f"{client_host}:{request.url.path}"
-        now = time.time()
-        bucket = RATE_LIMIT_BUCKET[key]
-        bucket[:] = [ts for ts in bucket if now - ts < window_seconds]
-        if len(bucket) >= limit:
+        route = request.scope.get("route")
+        path = getattr(route, "path", request.url.path)
+        rule = next((r for r in get_rules() if r.matches(path)), None)
+        if rule is None:
+            rule = RateLimitRule(path, limit, window_seconds)
+        if rule.limit <= 0:
+            return
+        key = f"{_identity(request)}:{rule.pattern}"
+        if not await get_backend().hit(key, rule.limit, rule.window_seconds):
             raise ApiException(status_code=429, code="RATE_LIMIT", message="Too many requests")
-        bucket.append(now)
 
     return _limit
@@ -1,8 +1,8 @@
 from typing import Any
 
 
-def ok(data: Any) -> dict:
-    return {"ok": True, "data": data}
+def ok(data: Any, **meta: Any) -> dict:
+    return {"ok": True, "data": data, **meta}
 
 
 def error(code: str, message: str) -> dict:
@@ -1,4 +1,4 @@
-from api.routers import auth, bot, internal, logs, market, notifications, profile, reports, settings
+from api.routers import auth, bot, internal, logs, market, notifications, profile, reports, settings, stream
 
 __all__ = [
     "auth",
@@ -10,4 +10,5 @@ __all__ = [
     "profile",
     "reports",
     "settings",
+    "stream",
 ]
@@ -2,13 +2,16 @@ from __future__ import annotations
 
 from fastapi import APIRouter
 
-from api.auth import create_access_token
+from api.auth import create_access_token, invalidate_user
 from api.errors import ApiException
 from api.responses import ok
 from api.schemas import LoginRequest, LoginResponse, Profile
+from api.telegram import dispatcher
 from core.config import get_settings
 from core.db import get_db
+from core.telegram_users import link_telegram_user
 from core.utils import hash_token, is_valid_wallet, now_utc
+from core.versions import bump_versions
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -73,12 +76,11 @@ async def login(payload: LoginRequest):
     )
 
     if payload.telegram_user_id:
-        await db.telegram_users.update_one(
-            {"telegram_user_id": payload.telegram_user_id},
-            {"$set": {"wallet_address": wallet}},
-            upsert=True,
-        )
+        await link_telegram_user(payload.telegram_user_id, wallet)
+        dispatcher.invalidate_chat(wallet)
 
+    invalidate_user(wallet)
+    await bump_versions([wallet])
     token = create_access_token(wallet)
     user = await db.users.find_one({"wallet_address": wallet})
     profile = _build_profile(user)
@@ -3,18 +3,31 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
+from bson import ObjectId
+from bson.errors import InvalidId
 from fastapi import APIRouter, Depends
+from pymongo.errors import DuplicateKeyError
+from web3 import Web3
 
 from api.auth import get_current_user
 from api.errors import ApiException
 from api.responses import ok
+from api.services import format_doc
+from core.chain import get_web3, preflight, rpc_batch
 from core.config import get_settings
 from core.crypto import decrypt_private_key
 from core.db import get_db
-from core.utils import now_utc
+from core.utils import as_utc, now_utc
+
+log = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/deploy", tags=["deploy"])
 
@@ -36,6 +49,24 @@ _KNOWN_ROUTERS = [
     "0xE592427A0AEce92De3Edee1F18E0157C05861564",  # Uniswap V3
 ]
 
+_APPROVED_ROUTERS_SELECTOR = Web3.to_hex(Web3.keccak(text="approvedRouters(address)")[:4])
+
+# Shared deadline for the approval / pause receipts, which are broadcast together.
+RECEIPT_TIMEOUT = 120
+
+# Deploys wait minutes on receipts, so they get their own small pool instead of
+# pinning threads of the default executor that `asyncio.to_thread` callers share.
+_executor = ThreadPoolExecutor(max_workers=get_settings().deploy_workers, thread_name_prefix="deploy")
+# Running job tasks, referenced so they aren't garbage collected mid-deploy.
+_jobs: set[asyncio.Task] = set()
+# An active job not updated for this long belongs to a process that died. Jobs
+# touch `updated_at` every HEARTBEAT_EVERY while their task is alive, including
+# while queued for a DEPLOY_WORKERS slot.
+STALE_JOB_AFTER = timedelta(minutes=15)
+HEARTBEAT_EVERY = STALE_JOB_AFTER / 3
+# Stages at which an expired job can still stop without leaving a transaction behind.
+_BEFORE_BROADCAST = ("running", "signed")
+
 
 def _find_artifact(configured_path: str = "") -> Optional[Path]:
     """Locate the compiled FlashLoan Hardhat artifact.
@@ -57,43 +88,103 @@ def _find_artifact(configured_path: str = "") -> Optional[Path]:
     return None
 
 
+@dataclass(frozen=True)
+class FlashLoanArtifact:
+    """A parsed Hardhat artifact plus everything derived from it, computed once
+    per artifact file version (path + mtime)."""
+
+    path: Path
+    mtime_ns: int
+    abi: list
+    bytecode: str
+    bytecode_size_bytes: int
+    bytecode_sha256: str
+    abi_functions: tuple[str, ...]
+    function_names: frozenset[str]
+    has_safe_erc20: bool
+
+    @classmethod
+    def parse(cls, path: Path, mtime_ns: int) -> "FlashLoanArtifact":
+        artifact = json.loads(path.read_text())
+        abi = artifact["abi"]
+        deployed_bytecode = artifact.get("deployedBytecode", "")
+        names = tuple(e["name"] for e in abi if "name" in e)
+        return cls(
+            path=path,
+            mtime_ns=mtime_ns,
+            abi=abi,
+            bytecode=artifact["bytecode"],
+            bytecode_size_bytes=(len(deployed_bytecode) - 2) // 2,
+            bytecode_sha256=hashlib.sha256(deployed_bytecode.encode()).hexdigest(),
+            abi_functions=names,
+            function_names=frozenset(names),
+            has_safe_erc20="SafeERC20FailedOperation" in names,
+        )
+
+
+# Resolved artifact path per FLASH_LOAN_ABI_PATH, and the parsed artifact per path.
+_artifact_paths: dict[str, Path] = {}
+_artifacts: dict[Path, FlashLoanArtifact] = {}
+
+
+def _load_artifact(configured_path: str = "") -> Optional[FlashLoanArtifact]:
+    """The FlashLoan artifact, re-parsed only when its file changes: a cached
+    call costs one `stat` instead of a directory walk and a JSON parse."""
+    path = _artifact_paths.get(configured_path)
+    try:
+        mtime_ns = path.stat().st_mtime_ns if path else None
+    except OSError:
+        mtime_ns = None
+    if mtime_ns is None:
+        path = _find_artifact(configured_path)
+        if path is None:
+            _artifact_paths.pop(configured_path, None)
+            return None
+        _artifact_paths[configured_path] = path
+        mtime_ns = path.stat().st_mtime_ns
+
+    artifact = _artifacts.get(path)
+    if artifact is None or artifact.mtime_ns != mtime_ns:
+        artifact = _artifacts[path] = FlashLoanArtifact.parse(path, mtime_ns)
+    return artifact
+
+
 async def _deploy(
     rpc_url: str,
     private_key: str,
     network: str,
     abi_path: str = "",
     old_contract_address: Optional[str] = None,
+    on_stage: Optional[Callable[..., None]] = None,
 ) -> dict:
-    """Deploy FlashLoan.sol and return {address, tx_hash}. Runs in a thread."""
-    from web3 import Web3
+    """Deploy FlashLoan.sol, approve routers and pause the old contract.
+
+    Returns {address, tx_hash, routers, old_contract_pause}. Runs on the deploy
+    executor; `on_stage(stage, **fields)` is called from that thread as it progresses.
+    """
+    report = on_stage or (lambda stage, **fields: None)
 
     addresses_provider = _ADDRESSES_PROVIDER.get(network)
     if not addresses_provider:
         raise ValueError(f"Unsupported network for deploy: {network}. Use 'sepolia' or 'mainnet'.")
 
-    artifact_path = _find_artifact(abi_path)
-    if artifact_path is None:
+    artifact = _load_artifact(abi_path)
+    if artifact is None:
         raise FileNotFoundError(
             "FlashLoan artifact not found. "
             "Run `npx hardhat compile` in not-bot/ first, or run `make contract-compile`."
         )
 
-    artifact = json.loads(artifact_path.read_text())
-    abi = artifact["abi"]
-    bytecode = artifact["bytecode"]
+    abi = artifact.abi
+    bytecode = artifact.bytecode
 
     def _blocking_deploy() -> dict:
-        import logging as _logging
-        log = _logging.getLogger(__name__)
-
-        w3 = Web3(Web3.HTTPProvider(rpc_url, request_kwargs={"timeout": 120}))
+        report("running")
+        w3 = get_web3(rpc_url)
         account = w3.eth.account.from_key(private_key)
         sender = account.address
 
-        chain_id = w3.eth.chain_id
-        gas_price = w3.eth.gas_price
-        nonce = w3.eth.get_transaction_count(sender)
-        balance = w3.eth.get_balance(sender)
+        chain_id, gas_price, nonce, balance = preflight(rpc_url, sender)
 
         log.info(
             "Deploy attempt: network=%s chain_id=%s sender=%s balance_eth=%.6f gas_price_gwei=%.2f",
@@ -122,8 +213,10 @@ async def _deploy(
         })
 
         signed = w3.eth.account.sign_transaction(tx, private_key)
+        report("signed")
         tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
         log.info("Deploy tx sent: %s", tx_hash.hex())
+        report("broadcast", tx_hash=tx_hash.hex())
         receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=300)
 
         if receipt["status"] != 1:
@@ -131,40 +224,60 @@ async def _deploy(
 
         new_address = receipt["contractAddress"]
         log.info("Deployed at %s", new_address)
-
-        # Approve all known DEX routers on the freshly deployed contract.
-        current_nonce = nonce + 1
-        current_nonce = _approve_routers_blocking(
-            w3, abi, new_address, account.address, private_key,
-            gas_price, chain_id, current_nonce, log,
+        report("mined", address=new_address)
+
+        # Approve all known DEX routers on the freshly deployed contract and pause the
+        # old one: every tx is broadcast back-to-back with local nonces, then the
+        # receipts are awaited together so they all land in the next block or two.
+        routers, next_nonce = _send_router_approvals(
+            w3, abi, new_address, sender, private_key,
+            gas_price, chain_id, nonce + 1, log,
         )
+        pause = None
+        if old_contract_address and old_contract_address.lower() != new_address.lower():
+            pause = _send_pause_old(
+                w3, abi, old_contract_address, sender, private_key,
+                gas_price, chain_id, next_nonce, log,
+            )
+        _await_receipts(w3, routers + ([pause] if pause else []), log)
+        report("routers_approved", routers=routers)
+        if pause:
+            report("old_paused", old_contract_pause=pause)
 
         return {
             "address": new_address,
             "tx_hash": tx_hash.hex(),
-            "nonce_after_deploy": current_nonce,
+            "routers": routers,
+            "old_contract_pause": pause,
         }
 
-    result = await asyncio.to_thread(_blocking_deploy)
+    return await asyncio.get_running_loop().run_in_executor(_executor, _blocking_deploy)
 
-    # Pause the old contract if one was provided and it differs from the new one.
-    if old_contract_address:
-        try:
-            await asyncio.to_thread(
-                _blocking_pause_old,
-                old_contract_address, abi, rpc_url, private_key,
-                result["nonce_after_deploy"],
-            )
-        except Exception as exc:
-            import logging as _logging
-            _logging.getLogger(__name__).warning(
-                "Failed to pause old contract %s: %s", old_contract_address, exc
-            )
 
-    return result
+def _send_signed(w3, tx: dict, private_key: str) -> str:
+    signed = w3.eth.account.sign_transaction(tx, private_key)
+    return w3.to_hex(w3.eth.send_raw_transaction(signed.raw_transaction))
 
 
-def _approve_routers_blocking(
+def _approved_routers(w3, contract_address: str, routers: list[str]) -> dict[str, bool]:
+    """approvedRouters(router) for every router in one JSON-RPC batch. Routers
+    whose check fails (e.g. the contract lacks the view) are left out."""
+    calls = [
+        ("eth_call", [{"to": contract_address, "data": _APPROVED_ROUTERS_SELECTOR + router[2:].lower().rjust(64, "0")}, "latest"])
+        for router in routers
+    ]
+    try:
+        results = rpc_batch(w3.provider.endpoint_uri, calls)
+    except Exception:
+        return {}
+    return {
+        router: int(result, 16) != 0
+        for router, result in zip(routers, results)
+        if isinstance(result, str) and len(result) > 2
+    }
+
+
+def _send_router_approvals(
     w3,
     abi: list,
     contract_address: str,
@@ -174,80 +287,99 @@ def _approve_routers_blocking(
     chain_id: int,
     start_nonce: int,
     log,
-) -> int:
-    """Call setRouterApproval(router, true) for every known DEX router. Returns next nonce."""
+) -> tuple[list[dict], int]:
+    """Broadcast setRouterApproval(router, true) for every known DEX router without
+    waiting for receipts. Returns per-router results and the next free nonce."""
     contract = w3.eth.contract(
         address=w3.to_checksum_address(contract_address),
         abi=abi,
     )
+    routers = [w3.to_checksum_address(router_addr) for router_addr in _KNOWN_ROUTERS]
+    approved = _approved_routers(w3, contract.address, routers)
+    results: list[dict] = []
     nonce = start_nonce
-    for router_addr in _KNOWN_ROUTERS:
-        checksum = w3.to_checksum_address(router_addr)
+    for checksum in routers:
+        if approved.get(checksum):
+            log.info("Router %s already approved — skipping", checksum)
+            results.append({"router": checksum, "status": "already_approved"})
+            continue
+
         try:
-            already = contract.functions.approvedRouters(checksum).call()
-            if already:
-                log.info("Router %s already approved — skipping", checksum)
-                continue
-        except Exception:
-            pass  # contract may not expose the view yet; attempt the tx anyway
-
-        tx = contract.functions.setRouterApproval(checksum, True).build_transaction({
-            "from": sender,
-            "nonce": nonce,
-            "gasPrice": int(gas_price * 1.1),
-            "gas": 80_000,
-            "chainId": chain_id,
-        })
-        signed = w3.eth.account.sign_transaction(tx, private_key)
-        tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
-        receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-        if receipt["status"] == 1:
-            log.info("Approved router %s (tx %s)", checksum, tx_hash.hex())
-        else:
-            log.warning("setRouterApproval reverted for %s", checksum)
+            tx = contract.functions.setRouterApproval(checksum, True).build_transaction({
+                "from": sender,
+                "nonce": nonce,
+                "gasPrice": int(gas_price * 1.1),
+                "gas": 80_000,
+                "chainId": chain_id,
+            })
+            tx_hash = _send_signed(w3, tx, private_key)
+        except Exception as exc:
+            # Nothing was broadcast, so the nonce is still free for the next router.
+            log.warning("setRouterApproval send failed for %s: %s", checksum, exc)
+            results.append({"router": checksum, "status": "failed", "error": str(exc)})
+            continue
+        results.append({"router": checksum, "status": "pending", "tx_hash": tx_hash})
         nonce += 1
-    return nonce
+    return results, nonce
 
 
-def _blocking_pause_old(
-    old_address: str,
+def _send_pause_old(
+    w3,
     abi: list,
-    rpc_url: str,
+    old_address: str,
+    sender: str,
     private_key: str,
+    gas_price: int,
+    chain_id: int,
     nonce: int,
-) -> None:
-    import logging as _logging
-    log = _logging.getLogger(__name__)
-
-    from web3 import Web3
-    w3 = Web3(Web3.HTTPProvider(rpc_url, request_kwargs={"timeout": 60}))
+    log,
+) -> Optional[dict]:
+    """Broadcast pause() on the previous contract without waiting for the receipt.
 
-    # Skip if the contract has no pause() function or is already paused.
+    Returns None when there is nothing to pause; a failure to pause never fails
+    the deploy, it is only reported.
+    """
     old = w3.eth.contract(address=w3.to_checksum_address(old_address), abi=abi)
     try:
         if old.functions.paused().call():
             log.info("Old contract %s already paused — skipping", old_address)
-            return
+            return None
     except Exception:
         log.info("Old contract %s does not support pause() — skipping", old_address)
-        return
+        return None
 
-    account = w3.eth.account.from_key(private_key)
-    gas_price = w3.eth.gas_price
-    tx = old.functions.pause().build_transaction({
-        "from": account.address,
-        "nonce": nonce,
-        "gasPrice": int(gas_price * 1.1),
-        "gas": 60_000,
-        "chainId": w3.eth.chain_id,
-    })
-    signed = w3.eth.account.sign_transaction(tx, private_key)
-    tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
-    receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-    if receipt["status"] == 1:
-        log.info("Old contract %s paused (tx %s)", old_address, tx_hash.hex())
-    else:
-        log.warning("Pause tx for %s reverted", old_address)
+    try:
+        tx = old.functions.pause().build_transaction({
+            "from": sender,
+            "nonce": nonce,
+            "gasPrice": int(gas_price * 1.1),
+            "gas": 60_000,
+            "chainId": chain_id,
+        })
+        tx_hash = _send_signed(w3, tx, private_key)
+    except Exception as exc:
+        log.warning("Failed to pause old contract %s: %s", old_address, exc)
+        return {"contract": old_address, "status": "failed", "error": str(exc)}
+    return {"contract": old_address, "status": "pending", "tx_hash": tx_hash}
+
+
+def _await_receipts(w3, pending: list[dict], log, timeout: float = RECEIPT_TIMEOUT) -> None:
+    """Wait for every broadcast tx in `pending` under one shared deadline and set
+    each entry's status to `confirmed`, `reverted` or `timeout`."""
+    deadline = time.monotonic() + timeout
+    for entry in pending:
+        if entry["status"] != "pending":
+            continue
+        remaining = max(deadline - time.monotonic(), 1)
+        try:
+            receipt = w3.eth.wait_for_transaction_receipt(entry["tx_hash"], timeout=remaining)
+        except Exception as exc:
+            log.warning("No receipt for tx %s: %s", entry["tx_hash"], exc)
+            entry["status"] = "timeout"
+            continue
+        entry["status"] = "confirmed" if receipt["status"] == 1 else "reverted"
+        if entry["status"] == "reverted":
+            log.warning("Tx %s reverted (%s)", entry["tx_hash"], entry.get("router") or entry.get("contract"))
 
 
 @router.post(
@@ -285,12 +417,12 @@ async def approve_routers(user: dict = Depends(get_current_user)):
         raise ApiException(status_code=400, code="NO_CONTRACT",
                            message="No deployed contract found in settings")
 
-    artifact_path = _find_artifact(app_settings.flash_loan_abi_path)
-    if artifact_path is None:
+    artifact = _load_artifact(app_settings.flash_loan_abi_path)
+    if artifact is None:
         raise ApiException(status_code=503, code="ARTIFACT_MISSING",
                            message="FlashLoan artifact not found")
 
-    abi = json.loads(artifact_path.read_text())["abi"]
+    abi = artifact.abi
 
     try:
         private_key = decrypt_private_key(encrypted_key, wallet, app_settings.wallet_encryption_key)
@@ -300,26 +432,25 @@ async def approve_routers(user: dict = Depends(get_current_user)):
 
     try:
         def _run():
-            import logging as _logging
-            log = _logging.getLogger(__name__)
-            from web3 import Web3
-            w3 = Web3(Web3.HTTPProvider(app_settings.deploy_rpc_url,
-                                        request_kwargs={"timeout": 120}))
+            rpc_url = app_settings.deploy_rpc_url
+            w3 = get_web3(rpc_url)
             account = w3.eth.account.from_key(private_key)
-            nonce = w3.eth.get_transaction_count(account.address)
-            gas_price = w3.eth.gas_price
-            _approve_routers_blocking(
+            chain_id, gas_price, nonce, _ = preflight(rpc_url, account.address)
+            results, _ = _send_router_approvals(
                 w3, abi, contract_address, account.address, private_key,
-                gas_price, w3.eth.chain_id, nonce, log,
+                gas_price, chain_id, nonce, log,
             )
+            _await_receipts(w3, results, log)
+            return results
 
-        await asyncio.to_thread(_run)
+        routers = await asyncio.get_running_loop().run_in_executor(_executor, _run)
     except Exception as exc:
         raise ApiException(status_code=500, code="APPROVE_FAILED", message=str(exc))
     finally:
         del private_key
 
-    return ok({"approved_routers": _KNOWN_ROUTERS, "contract": contract_address})
+    approved = [r["router"] for r in routers if r["status"] in ("confirmed", "already_approved")]
+    return ok({"approved_routers": approved, "routers": routers, "contract": contract_address})
 
 
 @router.get(
@@ -329,42 +460,157 @@ async def approve_routers(user: dict = Depends(get_current_user)):
 )
 async def artifact_info(_: dict = Depends(get_current_user)):
     app_settings = get_settings()
-    artifact_path = _find_artifact(app_settings.flash_loan_abi_path)
-    if artifact_path is None:
+    artifact = _load_artifact(app_settings.flash_loan_abi_path)
+    if artifact is None:
         raise ApiException(
             status_code=503,
             code="ARTIFACT_MISSING",
             message="FlashLoan artifact not found. Run `npx hardhat compile` in not-bot/.",
         )
-    artifact = json.loads(artifact_path.read_text())
-    deployed_bytecode = artifact.get("deployedBytecode", "")
-    bytecode_hash = hashlib.sha256(deployed_bytecode.encode()).hexdigest()
-    fn_names = [e["name"] for e in artifact.get("abi", []) if "name" in e]
     return ok({
-        "artifact_path": str(artifact_path),
-        "bytecode_size_bytes": (len(deployed_bytecode) - 2) // 2,
-        "bytecode_sha256": bytecode_hash,
-        "has_pause": "pause" in fn_names,
-        "has_approved_routers": "approvedRouters" in fn_names,
-        "has_safe_erc20": any(e.get("name") == "SafeERC20FailedOperation" for e in artifact.get("abi", [])),
+        "artifact_path": str(artifact.path),
+        "bytecode_size_bytes": artifact.bytecode_size_bytes,
+        "bytecode_sha256": artifact.bytecode_sha256,
+        "has_pause": "pause" in artifact.function_names,
+        "has_approved_routers": "approvedRouters" in artifact.function_names,
+        "has_safe_erc20": artifact.has_safe_erc20,
         "network": app_settings.deploy_network,
-        "abi_functions": fn_names,
+        "abi_functions": list(artifact.abi_functions),
     })
 
 
+async def _record_stage(job_id: ObjectId, stage: str, fields: dict) -> bool:
+    """Store a stage; False when the job is no longer active (it was expired)."""
+    now = now_utc()
+    result = await get_db().deploy_jobs.update_one(
+        {"_id": job_id, "active": True},
+        {
+            "$set": {"status": "running", "stage": stage, "updated_at": now, **fields},
+            "$push": {"stages": {"stage": stage, "at": now}},
+        },
+    )
+    return result.matched_count > 0
+
+
+async def _finish_job(job_id: ObjectId, status: str, only_active: bool = True, **fields) -> None:
+    now = now_utc()
+    await get_db().deploy_jobs.update_one(
+        {"_id": job_id, "active": True} if only_active else {"_id": job_id},
+        {
+            "$set": {"status": status, "stage": status, "updated_at": now, **fields},
+            "$push": {"stages": {"stage": status, "at": now}},
+            "$unset": {"active": ""},
+        },
+    )
+
+
+async def _expire_stale_jobs(query: dict) -> None:
+    await get_db().deploy_jobs.update_many(
+        {**query, "active": True, "updated_at": {"$lt": now_utc() - STALE_JOB_AFTER}},
+        {
+            "$set": {
+                "status": "failed",
+                "error": {"code": "DEPLOY_INTERRUPTED", "message": "Deploy was interrupted by a server restart"},
+            },
+            "$unset": {"active": ""},
+        },
+    )
+
+
+async def _heartbeat(job_id: ObjectId) -> None:
+    while True:
+        await asyncio.sleep(HEARTBEAT_EVERY.total_seconds())
+        await get_db().deploy_jobs.update_one(
+            {"_id": job_id, "active": True}, {"$set": {"updated_at": now_utc()}}
+        )
+
+
+async def _run_deploy_job(job_id: ObjectId, wallet: str, private_key: str, old_contract: Optional[str]) -> None:
+    app_settings = get_settings()
+    loop = asyncio.get_running_loop()
+
+    def on_stage(stage: str, **fields) -> None:
+        # Called from the deploy thread; wait so stages are stored in order.
+        coro = _record_stage(job_id, stage, fields)
+        try:
+            active = asyncio.run_coroutine_threadsafe(coro, loop).result(timeout=10)
+        except RuntimeError:
+            coro.close()  # the loop is gone (shutdown); the job expires as stale
+            return
+        except Exception as exc:
+            log.warning("Failed to record deploy stage %s for job %s: %s", stage, job_id, exc)
+            return
+        if not active and stage in _BEFORE_BROADCAST:
+            # Expired jobs free the wallet for a new deploy; stop before racing it on the nonce.
+            # Once broadcast, the deploy runs to the end so the contract isn't lost.
+            raise RuntimeError(f"Deploy job {job_id} is no longer active")
+
+    heartbeat = asyncio.create_task(_heartbeat(job_id))
+    try:
+        result = await _deploy(
+            app_settings.deploy_rpc_url,
+            private_key,
+            app_settings.deploy_network,
+            app_settings.flash_loan_abi_path,
+            old_contract_address=old_contract,
+            on_stage=on_stage,
+        )
+    except Exception as exc:
+        if isinstance(exc, FileNotFoundError):
+            code = "ARTIFACT_MISSING"
+        elif isinstance(exc, ValueError):
+            code = "DEPLOY_CONFIG_ERROR"
+        else:
+            code = "DEPLOY_FAILED"
+        log.warning("Deploy job %s failed: %s", job_id, exc)
+        await _finish_job(job_id, "failed", error={"code": code, "message": str(exc)})
+        return
+    finally:
+        heartbeat.cancel()
+        del private_key
+
+    await get_db().settings.update_one(
+        {"wallet_address": wallet},
+        {
+            "$set": {
+                "flash_loan_contract": result["address"],
+                "updated_at": now_utc(),
+            }
+        },
+        upsert=True,
+    )
+    # Recorded even if the job expired meanwhile: the contract exists on-chain.
+    await _finish_job(
+        job_id, "succeeded", only_active=False, error=None,
+        address=result["address"], tx_hash=result["tx_hash"],
+    )
+
+
+def _job_view(job: dict) -> dict:
+    job = format_doc(job)
+    job.pop("active", None)
+    for field in ("created_at", "updated_at"):
+        job[field] = as_utc(job[field])
+    return job
+
+
 @router.post(
     "/contract",
     summary="Deploy FlashLoan smart contract",
     description=(
-        "Compiles (artifact must exist) and deploys `FlashLoan.sol` to the configured network "
-        "using the wallet's stored private key. On success the contract address is written to "
-        "the user's settings so auto-execution activates immediately.\n\n"
+        "Starts a background job that deploys `FlashLoan.sol` to the configured network "
+        "using the wallet's stored private key, approves the DEX routers and pauses the "
+        "previous contract. Returns the job (`202`) right away; follow it with "
+        "`GET /deploy/jobs/{id}`. On success the contract address is written to the user's "
+        "settings so auto-execution activates immediately. One deploy per wallet at a time "
+        "(`409 DEPLOY_IN_PROGRESS`).\n\n"
         "**Prerequisites:**\n"
         "- `WALLET_ENCRYPTION_KEY` must be set on the server\n"
         "- `ETH_RPC_URL` must be set on the server (points at the target network)\n"
         "- The user must have stored their private key via `PUT /settings/wallet-key`\n"
         "- The FlashLoan artifact must exist (`make contract-compile`)"
     ),
+    status_code=202,
     response_model=None,
 )
 async def deploy_contract(user: dict = Depends(get_current_user)):
@@ -406,37 +652,58 @@ async def deploy_contract(user: dict = Depends(get_current_user)):
             message=f"Failed to decrypt wallet key: {exc}",
         )
 
+    await _expire_stale_jobs({"wallet_address": wallet})
+    now = now_utc()
+    job = {
+        "wallet_address": wallet,
+        "network": app_settings.deploy_network,
+        "old_contract": old_contract,
+        "status": "queued",
+        "stage": "queued",
+        "stages": [{"stage": "queued", "at": now}],
+        "active": True,
+        "created_at": now,
+        "updated_at": now,
+    }
     try:
-        result = await _deploy(
-            app_settings.deploy_rpc_url,
-            private_key,
-            app_settings.deploy_network,
-            app_settings.flash_loan_abi_path,
-            old_contract_address=old_contract,
-        )
-    except FileNotFoundError as exc:
-        raise ApiException(status_code=503, code="ARTIFACT_MISSING", message=str(exc))
-    except ValueError as exc:
-        raise ApiException(status_code=400, code="DEPLOY_CONFIG_ERROR", message=str(exc))
-    except Exception as exc:
-        raise ApiException(status_code=500, code="DEPLOY_FAILED", message=str(exc))
-    finally:
+        await db.deploy_jobs.insert_one(job)
+    except DuplicateKeyError:
         del private_key
+        raise ApiException(
+            status_code=409,
+            code="DEPLOY_IN_PROGRESS",
+            message="A deploy is already running for this wallet",
+        )
 
-    contract_address = result["address"]
-    await db.settings.update_one(
-        {"wallet_address": wallet},
-        {
-            "$set": {
-                "flash_loan_contract": contract_address,
-                "updated_at": now_utc(),
-            }
-        },
-        upsert=True,
-    )
+    task = asyncio.create_task(_run_deploy_job(job["_id"], wallet, private_key, old_contract))
+    del private_key
+    _jobs.add(task)
+    task.add_done_callback(_jobs.discard)
+    return ok(_job_view(job))
 
-    return ok({
-        "address": contract_address,
-        "tx_hash": result["tx_hash"],
-        "network": app_settings.deploy_network,
-    })
+
+@router.get(
+    "/jobs/{job_id}",
+    summary="Deploy job progress",
+    description=(
+        "Status of a deploy started by `POST /deploy/contract`. `status` is `queued`, `running`, "
+        "`succeeded` or `failed`; `stages` lists each step reached with its time: `queued`, "
+        "`running`, `signed`, `broadcast` (`tx_hash`), `mined` (`address`), `routers_approved` "
+        "(per-router `routers`), `old_paused` (`old_contract_pause`, only when there was a "
+        "contract to pause). Succeeded jobs carry the contract `address` and `tx_hash`; failed jobs "
+        "carry `error: {code, message}`."
+    ),
+    response_model=None,
+)
+async def deploy_job(job_id: str, user: dict = Depends(get_current_user)):
+    not_found = ApiException(status_code=404, code="JOB_NOT_FOUND", message="Deploy job not found")
+    try:
+        oid = ObjectId(job_id)
+    except InvalidId:
+        raise not_found
+    query = {"_id": oid, "wallet_address": user["wallet_address"]}
+    await _expire_stale_jobs(query)
+    job = await get_db().deploy_jobs.find_one(query)
+    if not job:
+        raise not_found
+    return ok(_job_view(job))
@@ -1,18 +1,30 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Header
+import asyncio
+import json
+import time
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, Header, Query, Request
+from pydantic import ValidationError
 
 from api.errors import ApiException
+from api.ingest import EventBatch
 from api.responses import ok
 from api.schemas import FlashLoanContractPayload, InternalEvent
-from api.services import create_log, create_notification
-from api.telegram import notify_wallet
+from api.services import format_doc
 from core.config import get_settings
+from core.bot_control import BOT_EVENTS_SEQ
 from core.db import get_db
+from core.sequences import contiguous, current_seq
 from core.utils import now_utc
 
 router = APIRouter(prefix="/internal", tags=["internal"])
 
+MAX_BATCH_EVENTS = 1000
+MAX_BOT_EVENTS = 500
+_BOT_EVENTS_POLL_SECONDS = 0.5
+
 
 async def verify_internal_key(x_internal_key: str | None = Header(default=None)) -> None:
   settings = get_settings()
@@ -35,100 +47,80 @@ async def verify_internal_key(x_internal_key: str | None = Header(default=None))
   response_model=None,
 )
 async def internal_event(payload: InternalEvent, _=Depends(verify_internal_key)):
-  db = get_db()
-  wallet = payload.wallet_address.lower()
-  event_type = payload.type
-  data = payload.payload
-
-  if event_type == "op":
-    op = {
-      "wallet_address": wallet,
-      "timestamp": data.get("timestamp", now_utc()),
-      "pair": data.get("pair", ""),
-      "dex": data.get("dex", ""),
-      "profit": float(data.get("profit", 0)),
-      "fees": float(data.get("fees", 0)),
-      "exec_time_ms": int(data.get("exec_time_ms", 0)),
-      "status": data.get("status", "success"),
-      "error_message": data.get("error_message"),
-    }
-    await db.ops.insert_one(op)
-    if op["status"] == "success":
-      user = await db.users.find_one({"wallet_address": wallet})
-      total_profit = (user.get("total_profit", 0.0) if user else 0.0) + op["profit"]
-      successful = (user.get("successful_arbs", 0) if user else 0) + 1
-      avg = total_profit / successful if successful else 0.0
-      await db.users.update_one(
-        {"wallet_address": wallet},
-        {
-          "$set": {
-            "total_profit": total_profit,
-            "successful_arbs": successful,
-            "avg_profitability": avg,
-          }
-        },
-        upsert=True,
-      )
-      await create_notification(wallet, "deal", "Deal completed", f"Profit {op['profit']}")
-      await notify_wallet(wallet, f"Deal completed: {op['pair']} profit {op['profit']}")
-
-  elif event_type == "log":
-    await create_log(wallet, data.get("level", "info"), data.get("message", ""), data.get("context"))
-
-  elif event_type == "notification":
-    await create_notification(
-      wallet, data.get("type", "info"), data.get("title", "Update"), data.get("message", "")
-    )
-    await notify_wallet(wallet, f"{data.get('title', 'Update')}: {data.get('message', '')}")
-
-  elif event_type == "opportunity":
-    await db.opportunities.insert_one({
-      "wallet_address": wallet,
-      "pair": data.get("pair", ""),
-      "buy_dex": data.get("buy_dex", ""),
-      "sell_dex": data.get("sell_dex", ""),
-      "expected_profit_pct": float(data.get("expected_profit_pct", 0)),
-      "liquidity_score": float(data.get("liquidity_score", 0)),
-      "gas_price_gwei": float(data.get("gas_price_gwei", 0)),
-      "timestamp": data.get("timestamp", now_utc()),
-    })
-    await create_notification(
-      wallet,
-      "opportunity",
-      data.get("title", "Opportunity found"),
-      data.get("message", "New route detected"),
-    )
-    tg_message = (
-      f"<b>Arbitrage opportunity</b>\n"
-      f"Pair: <b>{data.get('pair', '--')}</b>\n"
-      f"Buy on: {data.get('buy_dex', '--')}\n"
-      f"Sell on: {data.get('sell_dex', '--')}\n"
-      f"Expected profit: <b>{float(data.get('expected_profit_pct', 0)):.2f}%</b>\n"
-      f"Gas: {float(data.get('gas_price_gwei', 0)):.1f} Gwei"
-    )
-    await notify_wallet(wallet, tg_message)
-
-  elif event_type == "status":
-    last_error = data.get("last_error")
-    await db.bot_state.update_one(
-      {"wallet_address": wallet},
-      {
-        "$set": {
-          "status": data.get("status", "error"),
-          "last_error": last_error,
-          "last_change_at": now_utc(),
-        }
-      },
-      upsert=True,
+  batch = EventBatch()
+  try:
+    batch.add(0, payload)
+  except (ValueError, TypeError) as exc:
+    raise ApiException(status_code=400, code="EVENT_INVALID", message="Invalid event payload") from exc
+  errors = await batch.flush()
+  if errors:
+    raise ApiException(status_code=500, code="EVENT_WRITE_FAILED", message=errors[0])
+  return ok({"status": "accepted"})
+
+
+def _parse_batch(body: bytes, content_type: str) -> list[Any]:
+  """Split a request body into raw events. NDJSON lines that fail to parse are kept as `None`."""
+  if "ndjson" in content_type or "jsonl" in content_type:
+    items: list[Any] = []
+    for line in body.splitlines():
+      if not line.strip():
+        continue
+      try:
+        items.append(json.loads(line))
+      except ValueError:
+        items.append(None)
+    return items
+  try:
+    items = json.loads(body)
+  except ValueError as exc:
+    raise ApiException(status_code=400, code="EVENT_INVALID", message="Malformed event batch") from exc
+  if not isinstance(items, list):
+    raise ApiException(status_code=400, code="EVENT_INVALID", message="Expected a JSON array of events")
+  return items
+
+
+@router.post(
+  "/events",
+  summary="Ingest a batch of DEX monitor events",
+  description=(
+    "Bulk variant of `POST /internal/event`. The body is either a JSON array of events or "
+    "newline-delimited JSON (`Content-Type: application/x-ndjson`), one event per line, "
+    f"at most {MAX_BATCH_EVENTS} events. Requires `X-Internal-Key` header.\n\n"
+    "Writes are grouped into one bulk write per collection. The response lists a result for "
+    "every event in request order (`{index, ok, error?}`), so the monitor can retry only the "
+    "items that failed."
+  ),
+  response_model=None,
+)
+async def internal_events(request: Request, _=Depends(verify_internal_key)):
+  items = _parse_batch(await request.body(), request.headers.get("content-type", ""))
+  if len(items) > MAX_BATCH_EVENTS:
+    raise ApiException(
+      status_code=413,
+      code="BATCH_TOO_LARGE",
+      message=f"At most {MAX_BATCH_EVENTS} events per batch",
     )
-    if last_error:
-      await create_notification(wallet, "error", "Critical error", last_error)
-      await notify_wallet(wallet, f"Critical error: {last_error}")
 
-  else:
-    raise ApiException(status_code=400, code="EVENT_INVALID", message="Unknown event type")
+  batch = EventBatch()
+  errors: dict[int, dict] = {}
+  for index, item in enumerate(items):
+    try:
+      batch.add(index, InternalEvent.model_validate(item))
+    except (ValidationError, ValueError, TypeError):
+      errors[index] = {"code": "EVENT_INVALID", "message": "Invalid event payload"}
+    except ApiException as exc:
+      errors[index] = exc.detail
 
-  return ok({"status": "accepted"})
+  for index, message in (await batch.flush()).items():
+    errors[index] = {"code": "EVENT_WRITE_FAILED", "message": message}
+
+  results = []
+  for index in range(len(items)):
+    if index in errors:
+      results.append({"index": index, "ok": False, "error": errors[index]})
+    else:
+      results.append({"index": index, "ok": True})
+  return ok({"accepted": len(items) - len(errors), "failed": len(errors), "results": results})
 
 
 @router.get(
@@ -139,11 +131,54 @@ async def internal_event(payload: InternalEvent, _=Depends(verify_internal_key))
 )
 async def active_users(_=Depends(verify_internal_key)):
   db = get_db()
-  cursor = db.bot_state.find({"status": "active"}, {"wallet_address": 1})
+  cursor = db.bot_state.find({"status": "active"}, {"_id": 0, "wallet_address": 1})
   wallets = [doc.get("wallet_address") async for doc in cursor]
   return ok(wallets)
 
 
+@router.get(
+  "/bot-events",
+  summary="Bot start / stop events",
+  description=(
+    "Start / stop changes made through the API or the Telegram bot, oldest first, as "
+    "`{events: [{id, seq, wallet_address, status, created_at}], cursor}`. Pass the returned `cursor` "
+    "as `after` on the next call; without `after` only the current cursor is returned. With "
+    "`wait` the request is held up to that many seconds until an event arrives, so the monitor "
+    "reacts immediately instead of on its next `/internal/active-users` poll. Events are kept for "
+    "a day. Requires `X-Internal-Key` header."
+  ),
+  response_model=None,
+)
+async def bot_events(
+  after: Optional[str] = None,
+  wait: float = Query(0, ge=0, le=30),
+  _=Depends(verify_internal_key),
+):
+  db = get_db()
+  if after is None:
+    return ok({"events": [], "cursor": str(await current_seq(BOT_EVENTS_SEQ))})
+  try:
+    after_seq = int(after)
+  except ValueError as exc:
+    raise ApiException(status_code=400, code="CURSOR_INVALID", message="Invalid events cursor") from exc
+
+  deadline = time.monotonic() + wait
+  while True:
+    docs = await (
+      db.bot_events.find({"seq": {"$gt": after_seq}})
+      .sort("seq", 1)
+      .limit(MAX_BOT_EVENTS)
+      .to_list(length=MAX_BOT_EVENTS)
+    )
+    # Stop at a fresh gap in `seq`: an event from another process may still be landing there.
+    events = contiguous(docs, after_seq)
+    if events or time.monotonic() >= deadline:
+      break
+    await asyncio.sleep(_BOT_EVENTS_POLL_SECONDS)
+  cursor = str(events[-1]["seq"]) if events else str(after_seq)
+  return ok({"events": [format_doc(event) for event in events], "cursor": cursor})
+
+
 @router.get(
   "/wallet-key/{wallet_address}",
   summary="Get encrypted wallet key",
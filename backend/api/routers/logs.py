@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
 
 from api.auth import get_current_user
+from api.pagination import keyset_page
 from api.responses import ok
-from api.services import format_doc
+from api.versions import conditional_get
 from core.db import get_db
 
 router = APIRouter(prefix="", tags=["logs"])
@@ -13,11 +16,22 @@ router = APIRouter(prefix="", tags=["logs"])
 @router.get(
     "/logs/recent",
     summary="Recent bot logs",
-    description="Returns the most recent structured log entries for the authenticated wallet, newest first. Default limit is 20. Log levels: `info`, `warning`, `error`.",
+    description=(
+        "Returns the most recent structured log entries for the authenticated wallet, newest first. "
+        "Default limit is 20, max 100. Log levels: `info`, `warning`, `error`. "
+        "Page with `before=<next_cursor>` (older) or `after=<cursor>` (newer). "
+        "Supports `If-None-Match` (`304` while unchanged)."
+    ),
     response_model=None,
+    dependencies=[Depends(conditional_get)],
 )
-async def recent_logs(limit: int = 20, user: dict = Depends(get_current_user)):
+async def recent_logs(
+    limit: int = Query(20, ge=1, le=100),
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    user: dict = Depends(get_current_user),
+):
     db = get_db()
-    cursor = db.logs.find({"wallet_address": user["wallet_address"]}).sort("created_at", -1).limit(limit)
-    items = [format_doc(doc) async for doc in cursor]
-    return ok(items)
+    query = {"wallet_address": user["wallet_address"]}
+    items, next_cursor = await keyset_page(db.logs, query, "created_at", limit, before, after)
+    return ok(items, next_cursor=next_cursor)
@@ -3,7 +3,9 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends
 
 from api.auth import get_current_user
+from api.ingest import LATEST_OPPORTUNITIES
 from api.responses import ok
+from api.versions import conditional_get
 from core.db import get_db
 
 router = APIRouter(prefix="", tags=["market"])
@@ -12,14 +14,24 @@ router = APIRouter(prefix="", tags=["market"])
 @router.get(
     "/market/opportunities",
     summary="Live arbitrage opportunities",
-    description="Returns the 4 most recent arbitrage opportunities detected by the DEX monitor for the authenticated wallet, sorted by detection time descending.",
+    description=(
+        f"Returns the {LATEST_OPPORTUNITIES} most recent arbitrage opportunities detected by the DEX "
+        "monitor for the authenticated wallet, sorted by detection time descending. Served from a "
+        "per-wallet view kept up to date on ingest. Supports `If-None-Match` (`304` while unchanged)."
+    ),
     response_model=None,
+    dependencies=[Depends(conditional_get)],
 )
 async def market_opportunities(user: dict = Depends(get_current_user)):
     db = get_db()
+    view = await db.latest_opportunities.find_one({"_id": user["wallet_address"]}, {"items": 1})
+    if view is not None:
+        return ok(view.get("items", []))
+
+    # No opportunity ingested since the view was introduced; read the raw history once.
     cursor = db.opportunities.find(
         {"wallet_address": user["wallet_address"]},
         {"_id": 0},
-    ).sort("timestamp", -1).limit(4)
-    opportunities = await cursor.to_list(length=4)
+    ).sort("timestamp", -1).limit(LATEST_OPPORTUNITIES)
+    opportunities = await cursor.to_list(length=LATEST_OPPORTUNITIES)
     return ok(opportunities)
@@ -1,46 +1,111 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from bson import ObjectId
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 from api.auth import get_current_user
+from api.pagination import keyset_page
 from api.responses import ok
 from api.schemas import NotificationReadRequest
-from api.services import format_doc
+from api.services import unread_count
+from api.versions import conditional_get
 from core.db import get_db
+from core.notifications import add_unread
+from core.utils import now_utc
+from core.versions import bump_versions
 
 router = APIRouter(prefix="", tags=["notifications"])
 
 
+async def _unread(user: dict = Depends(get_current_user)) -> int:
+    # Resolved before `conditional_get`, so a due recount that corrects the
+    # counter bumps the version in time for this request's ETag check.
+    return await unread_count(user["wallet_address"])
+
+
 @router.get(
     "/notifications",
     summary="List notifications",
-    description="Returns the most recent notifications for the authenticated wallet, newest first. Default limit is 20.",
+    description=(
+        "Returns the most recent notifications for the authenticated wallet, newest first. "
+        "Default limit is 20, max 100. Page with `before=<next_cursor>` (older) or `after=<cursor>` (newer). "
+        "Supports `If-None-Match` (`304` while unchanged)."
+    ),
     response_model=None,
+    dependencies=[Depends(conditional_get)],
 )
-async def list_notifications(limit: int = 20, user: dict = Depends(get_current_user)):
+async def list_notifications(
+    limit: int = Query(20, ge=1, le=100),
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    user: dict = Depends(get_current_user),
+):
     db = get_db()
-    cursor = (
-        db.notifications.find({"wallet_address": user["wallet_address"]})
-        .sort("created_at", -1)
-        .limit(limit)
-    )
-    items = [format_doc(doc) async for doc in cursor]
-    return ok(items)
+    query = {"wallet_address": user["wallet_address"]}
+    items, next_cursor = await keyset_page(db.notifications, query, "created_at", limit, before, after)
+    return ok(items, next_cursor=next_cursor)
 
 
 @router.post(
     "/notifications/read",
     summary="Mark notifications as read",
-    description="Marks the specified notification IDs as read. Only affects notifications belonging to the authenticated wallet.",
+    description=(
+        "Marks the specified notification IDs as read. Only affects notifications belonging to the "
+        "authenticated wallet; `updated` is the number that were unread."
+    ),
     response_model=None,
 )
 async def mark_read(payload: NotificationReadRequest, user: dict = Depends(get_current_user)):
     db = get_db()
     if not payload.ids:
         return ok({"updated": 0})
-    await db.notifications.update_many(
-        {"wallet_address": user["wallet_address"], "_id": {"$in": [ObjectId(i) for i in payload.ids]}},
+    result = await db.notifications.update_many(
+        {
+            "wallet_address": user["wallet_address"],
+            "_id": {"$in": [ObjectId(i) for i in payload.ids]},
+            "read": False,
+        },
+        {"$set": {"read": True}},
+    )
+    await add_unread({user["wallet_address"]: -result.modified_count})
+    await bump_versions([user["wallet_address"]])
+    return ok({"updated": result.modified_count})
+
+
+@router.post(
+    "/notifications/read-all",
+    summary="Mark all notifications as read",
+    description="Marks every unread notification of the authenticated wallet as read and resets its unread count.",
+    response_model=None,
+)
+async def mark_all_read(user: dict = Depends(get_current_user)):
+    db = get_db()
+    result = await db.notifications.update_many(
+        {"wallet_address": user["wallet_address"], "read": False},
         {"$set": {"read": True}},
     )
-    return ok({"updated": len(payload.ids)})
+    await db.unread_counts.update_one(
+        {"_id": user["wallet_address"]},
+        {"$set": {"unread": 0, "recounted_at": now_utc()}},
+        upsert=True,
+    )
+    await bump_versions([user["wallet_address"]])
+    return ok({"updated": result.modified_count})
+
+
+@router.get(
+    "/notifications/unread-count",
+    summary="Unread notification count",
+    description=(
+        "Returns `{unread}` for the authenticated wallet from a counter maintained as notifications "
+        "are created and read. Supports `If-None-Match` (`304` while unchanged)."
+    ),
+    response_model=None,
+)
+async def get_unread_count(
+    unread: int = Depends(_unread),
+    _: None = Depends(conditional_get),
+):
+    return ok({"unread": unread})
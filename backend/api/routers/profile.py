@@ -5,7 +5,8 @@ from fastapi import APIRouter, Depends
 from api.auth import get_current_user
 from api.responses import ok
 from api.schemas import Profile
-from core.db import get_db
+from api.versions import conditional_get
+from core.rollups import get_rollup, summarize
 
 router = APIRouter(prefix="", tags=["profile"])
 
@@ -13,21 +14,18 @@ router = APIRouter(prefix="", tags=["profile"])
 @router.get(
     "/me",
     summary="Get current user profile",
-    description="Returns the authenticated user's profile including lifetime stats (total profit, successful arb count, average profitability) computed from actual trade history.",
+    description="Returns the authenticated user's profile including lifetime stats (total profit, successful arb count, average profitability) read from the wallet's op rollup. Supports `If-None-Match` (`304` while unchanged).",
     response_model=None,
+    dependencies=[Depends(conditional_get)],
 )
 async def me(user: dict = Depends(get_current_user)):
-    db = get_db()
-    ops = await db.ops.find({"wallet_address": user["wallet_address"]}).to_list(length=10000)
-    successes = [op for op in ops if op.get("status") == "success"]
-    total_profit = sum(op["profit"] for op in successes)
-    avg_profitability = total_profit / len(successes) if successes else 0.0
+    summary = summarize(await get_rollup(user["wallet_address"]))
     profile = Profile(
         wallet_address=user["wallet_address"],
         created_at=user.get("created_at"),
         last_login=user.get("last_login"),
-        total_profit=round(total_profit, 4),
-        successful_arbs=len(successes),
-        avg_profitability=round(avg_profitability, 4),
+        total_profit=summary["total_profit"],
+        successful_arbs=summary["successful_arbs"],
+        avg_profitability=summary["avg_profitability"],
     )
     return ok(profile.model_dump())
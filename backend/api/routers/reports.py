@@ -2,20 +2,32 @@ from __future__ import annotations
 
 import csv
 import io
-from datetime import datetime
-from typing import Optional
+import json
+from datetime import datetime, timezone
+from typing import AsyncIterator, Literal, Optional
 
 from fastapi import APIRouter, Depends, Query
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import StreamingResponse
 
 from api.auth import get_current_user
+from api.errors import ApiException
+from api.pagination import decode_cursor, keyset_page
 from api.responses import ok
 from api.services import format_doc
 from core.db import get_db
+from core.rollups import breakdown_range, get_rollup, merge_increments, summarize
+from core.retention import archives_in_range
+from core.utils import as_utc, parse_timestamp
 
 router = APIRouter(prefix="", tags=["reports"])
 
+_EXPORT_FIELDS = ("timestamp", "pair", "dex", "profit", "fees", "exec_time_ms", "status", "error_message")
+_EXPORT_BATCH_SIZE = 500
+_EXPORT_CHUNK_CHARS = 64 * 1024
+_EXPORT_ROW_GROUP_SIZE = 10_000
+_OLDEST = datetime.min.replace(tzinfo=timezone.utc)
+
 
 def _build_query(
     wallet_address: str,
@@ -41,7 +53,12 @@ def _build_query(
 @router.get(
     "/ops",
     summary="List trade operations",
-    description="Returns trade operations for the authenticated wallet, newest first. Supports filtering by date range, token pair, and DEX. Max 200 records.",
+    description=(
+        "Returns trade operations for the authenticated wallet, newest first. Supports filtering by "
+        "date range, token pair, and DEX. Max 500 records per page.\n\n"
+        "Pass the response's `next_cursor` as `before` to fetch the next (older) page, or a cursor "
+        "as `after` to fetch newer records."
+    ),
     response_model=None,
 )
 async def ops(
@@ -50,19 +67,34 @@ async def ops(
     to_ts: Optional[datetime] = Query(None, alias="to"),
     pair: Optional[str] = None,
     dex: Optional[str] = None,
-    limit: int = 200,
+    limit: int = Query(200, ge=1, le=500),
+    before: Optional[str] = None,
+    after: Optional[str] = None,
 ):
     db = get_db()
     query = _build_query(user["wallet_address"], from_ts, to_ts, pair, dex)
-    cursor = db.ops.find(query).sort("timestamp", -1).limit(limit)
-    ops_items = [format_doc(doc) async for doc in cursor]
-    return ok(ops_items)
+    # Only archive months the page can reach: the filter range, narrowed by the cursor.
+    lo, hi = from_ts, to_ts
+    if before:
+        hi = min(filter(None, (hi, decode_cursor(before)[0])), key=as_utc)
+    if after:
+        lo = max(filter(None, (lo, decode_cursor(after)[0])), key=as_utc)
+    archives = await archives_in_range(db, lo, hi)
+    ops_items, next_cursor = await keyset_page(db.ops, query, "timestamp", limit, before, after, union=archives)
+    return ok(ops_items, next_cursor=next_cursor)
 
 
 @router.get(
     "/stats/summary",
     summary="Aggregated trade statistics",
-    description="Returns aggregated stats for the filtered trade set: total profit, successful arb count, average profitability, and success rate.",
+    description=(
+        "Returns aggregated stats for the filtered trade set: total profit, successful arb count, "
+        "average profitability, and success rate. Unfiltered requests are answered from the "
+        "wallet's op rollup; filtered ones from hourly/daily stats buckets, with only the "
+        "partial hours at the range edges read from raw ops.\n\n"
+        "With `group_by=pair|dex|day` the response also carries a `groups` list with the same "
+        "stats per pair, DEX or UTC day (`YYYY-MM-DD`)."
+    ),
     response_model=None,
 )
 async def stats_summary(
@@ -71,26 +103,121 @@ async def stats_summary(
     to_ts: Optional[datetime] = Query(None, alias="to"),
     pair: Optional[str] = None,
     dex: Optional[str] = None,
+    group_by: Optional[Literal["pair", "dex", "day"]] = None,
 ):
-    db = get_db()
-    query = _build_query(user["wallet_address"], from_ts, to_ts, pair, dex)
-    ops_items = await db.ops.find(query).to_list(length=1000)
-    successes = [op for op in ops_items if op.get("status") == "success"]
-    total = len(ops_items)
-    profit = sum(op["profit"] for op in successes)
-    summary = {
-        "total_profit": round(profit, 4),
-        "successful_arbs": len(successes),
-        "avg_profitability": round(profit / len(successes), 4) if successes else 0.0,
-        "success_rate": round(len(successes) / total, 4) if total else 0.0,
-    }
+    if not (from_ts or to_ts or pair or dex or group_by):
+        return ok(summarize(await get_rollup(user["wallet_address"])))
+
+    groups = await breakdown_range(user["wallet_address"], from_ts, to_ts, pair, dex, group_by)
+    totals: dict = {}
+    for sums in groups.values():
+        merge_increments(totals, sums)
+    summary = summarize(totals)
+    if group_by:
+        summary["group_by"] = group_by
+        summary["groups"] = [
+            {"key": key, "ops_count": sums.get("ops_count", 0), **summarize(sums)}
+            for key, sums in sorted(groups.items(), key=lambda item: str(item[0]))
+        ]
     return ok(summary)
 
 
+def _newest_first(collection, query: dict, projection: dict, limit: Optional[int]):
+    cursor = collection.find(query, projection).sort("timestamp", -1).batch_size(_EXPORT_BATCH_SIZE)
+    if limit:
+        cursor = cursor.limit(limit)
+    return cursor
+
+
+def _ts_key(op: dict) -> datetime:
+    value = op.get("timestamp")
+    return parse_timestamp(value) if value is not None else _OLDEST
+
+
+async def _chain(cursors) -> AsyncIterator[dict]:
+    for cursor in cursors:
+        async for op in cursor:
+            yield op
+
+
+async def _merge_newest_first(left, right) -> AsyncIterator[dict]:
+    """Merge two newest-first op streams into one."""
+    left_op = await anext(left, None)
+    right_op = await anext(right, None)
+    while left_op is not None or right_op is not None:
+        if right_op is None or (left_op is not None and _ts_key(left_op) >= _ts_key(right_op)):
+            yield left_op
+            left_op = await anext(left, None)
+        else:
+            yield right_op
+            right_op = await anext(right, None)
+
+
+async def _export_rows(
+    query: dict,
+    projection: dict,
+    limit: Optional[int],
+    from_ts: Optional[datetime],
+    to_ts: Optional[datetime],
+) -> AsyncIterator[dict]:
+    """Ops matching `query`, newest first, from `ops` and its monthly archives.
+
+    Archive months don't overlap, so they are read one after another (newest
+    first) and merged with the hot collection, which may still hold late ops
+    older than the archive cutoff.
+    """
+    db = get_db()
+    archives = await archives_in_range(db, from_ts, to_ts)
+    rows = _newest_first(db.ops, query, projection, limit).__aiter__()
+    if archives:
+        archived = _chain(_newest_first(db[name], query, projection, limit) for name in archives)
+        rows = _merge_newest_first(rows, archived)
+    count = 0
+    async for op in rows:
+        yield op
+        count += 1
+        if limit and count >= limit:
+            break
+
+
+async def _csv_chunks(cursor) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(_EXPORT_FIELDS)
+    async for op in cursor:
+        writer.writerow([op.get(field) for field in _EXPORT_FIELDS])
+        if buffer.tell() >= _EXPORT_CHUNK_CHARS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+async def _json_chunks(cursor) -> AsyncIterator[str]:
+    parts = ["["]
+    size = 1
+    first = True
+    async for op in cursor:
+        item = json.dumps(jsonable_encoder(format_doc(op)))
+        parts.append(item if first else "," + item)
+        size += len(item) + 1
+        first = False
+        if size >= _EXPORT_CHUNK_CHARS:
+            yield "".join(parts)
+            parts = []
+            size = 0
+    parts.append("]")
+    yield "".join(parts)
+
+
 @router.get(
     "/export/csv",
     summary="Export operations as CSV",
-    description="Streams up to 2000 trade operations as a CSV file attachment. Supports the same filters as `/ops`.",
+    description=(
+        "Streams trade operations as a CSV file attachment, newest first. Supports the same filters "
+        "as `/ops`. Rows are streamed from the database cursor, so there is no size cap unless "
+        "`limit` is given."
+    ),
     response_model=None,
 )
 async def export_csv(
@@ -99,37 +226,23 @@ async def export_csv(
     to_ts: Optional[datetime] = Query(None, alias="to"),
     pair: Optional[str] = None,
     dex: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
 ):
-    db = get_db()
     query = _build_query(user["wallet_address"], from_ts, to_ts, pair, dex)
-    ops_items = await db.ops.find(query).sort("timestamp", -1).to_list(length=2000)
-
-    buffer = io.StringIO()
-    writer = csv.writer(buffer)
-    writer.writerow(["timestamp", "pair", "dex", "profit", "fees", "exec_time_ms", "status", "error_message"])
-    for op in ops_items:
-        writer.writerow(
-            [
-                op.get("timestamp"),
-                op.get("pair"),
-                op.get("dex"),
-                op.get("profit"),
-                op.get("fees"),
-                op.get("exec_time_ms"),
-                op.get("status"),
-                op.get("error_message"),
-            ]
-        )
-
-    buffer.seek(0)
+    projection = {"_id": 0, **{field: 1 for field in _EXPORT_FIELDS}}
+    cursor = _export_rows(query, projection, limit, from_ts, to_ts)
     headers = {"Content-Disposition": "attachment; filename=ops.csv"}
-    return StreamingResponse(buffer, media_type="text/csv", headers=headers)
+    return StreamingResponse(_csv_chunks(cursor), media_type="text/csv", headers=headers)
 
 
 @router.get(
     "/export/json",
     summary="Export operations as JSON",
-    description="Returns up to 2000 trade operations as a downloadable JSON file. Supports the same filters as `/ops`.",
+    description=(
+        "Streams trade operations as a downloadable JSON array, newest first. Supports the same "
+        "filters as `/ops`. Rows are streamed from the database cursor, so there is no size cap "
+        "unless `limit` is given."
+    ),
     response_model=None,
 )
 async def export_json(
@@ -138,10 +251,165 @@ async def export_json(
     to_ts: Optional[datetime] = Query(None, alias="to"),
     pair: Optional[str] = None,
     dex: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
 ):
-    db = get_db()
     query = _build_query(user["wallet_address"], from_ts, to_ts, pair, dex)
-    ops_items = await db.ops.find(query).sort("timestamp", -1).to_list(length=2000)
-    payload = [format_doc(doc) for doc in ops_items]
+    projection = {"wallet_address": 1, **{field: 1 for field in _EXPORT_FIELDS}}
+    cursor = _export_rows(query, projection, limit, from_ts, to_ts)
     headers = {"Content-Disposition": "attachment; filename=ops.json"}
-    return JSONResponse(content=jsonable_encoder(payload), headers=headers)
\ No newline at end of file
+    return StreamingResponse(_json_chunks(cursor), media_type="application/json", headers=headers)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back via `drain()`.
+
+    Keeps the absolute position so Parquet footers get correct offsets while
+    only the bytes written since the last drain are held in memory.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401 - registers pyarrow.parquet
+    except ImportError as exc:
+        raise ApiException(
+            status_code=503,
+            code="EXPORT_UNAVAILABLE",
+            message="Columnar export requires pyarrow on the server",
+        ) from exc
+    return pyarrow
+
+
+def _arrow_schema(pa):
+    return pa.schema([
+        ("timestamp", pa.timestamp("ms", tz="UTC")),
+        ("pair", pa.string()),
+        ("dex", pa.string()),
+        ("profit", pa.float64()),
+        ("fees", pa.float64()),
+        ("exec_time_ms", pa.int64()),
+        ("status", pa.string()),
+        ("error_message", pa.string()),
+    ])
+
+
+def _arrow_batch(pa, schema, rows: list[dict]):
+    columns: dict[str, list] = {field: [] for field in _EXPORT_FIELDS}
+    for op in rows:
+        for field in _EXPORT_FIELDS:
+            value = op.get(field)
+            if field == "timestamp" and value is not None:
+                value = parse_timestamp(value)
+            columns[field].append(value)
+    return pa.RecordBatch.from_pydict(columns, schema=schema)
+
+
+async def _columnar_chunks(cursor, pa, open_writer) -> AsyncIterator[bytes]:
+    """Stream ops as Arrow record batches (one Parquet row group each) through `open_writer`."""
+    schema = _arrow_schema(pa)
+    sink = _ChunkSink()
+    writer = open_writer(sink, schema)
+    rows: list[dict] = []
+    async for op in cursor:
+        rows.append(op)
+        if len(rows) >= _EXPORT_ROW_GROUP_SIZE:
+            writer.write_batch(_arrow_batch(pa, schema, rows))
+            rows = []
+            yield sink.drain()
+    if rows:
+        writer.write_batch(_arrow_batch(pa, schema, rows))
+    writer.close()
+    yield sink.drain()
+
+
+@router.get(
+    "/export/parquet",
+    summary="Export operations as Parquet",
+    description=(
+        "Streams trade operations as a zstd-compressed Parquet file with typed columns "
+        "(`timestamp`, `pair`, `dex`, `profit`, `fees`, `exec_time_ms`, `status`, `error_message`), "
+        f"one row group per {_EXPORT_ROW_GROUP_SIZE} rows. Supports the same filters as `/ops`. "
+        "Returns `503` if pyarrow is not installed on the server."
+    ),
+    response_model=None,
+)
+async def export_parquet(
+    user: dict = Depends(get_current_user),
+    from_ts: Optional[datetime] = Query(None, alias="from"),
+    to_ts: Optional[datetime] = Query(None, alias="to"),
+    pair: Optional[str] = None,
+    dex: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+):
+    pa = _require_pyarrow()
+    query = _build_query(user["wallet_address"], from_ts, to_ts, pair, dex)
+    projection = {"_id": 0, **{field: 1 for field in _EXPORT_FIELDS}}
+    cursor = _export_rows(query, projection, limit, from_ts, to_ts)
+
+    def open_writer(sink, schema):
+        return pa.parquet.ParquetWriter(sink, schema, compression="zstd")
+
+    headers = {"Content-Disposition": "attachment; filename=ops.parquet"}
+    return StreamingResponse(
+        _columnar_chunks(cursor, pa, open_writer),
+        media_type="application/vnd.apache.parquet",
+        headers=headers,
+    )
+
+
+@router.get(
+    "/export/arrow",
+    summary="Export operations as Arrow IPC stream",
+    description=(
+        "Streams trade operations in the Arrow IPC streaming format with the same typed columns "
+        "as `/export/parquet` (zstd-compressed buffers). Supports the same filters as `/ops`. "
+        "Returns `503` if pyarrow is not installed on the server."
+    ),
+    response_model=None,
+)
+async def export_arrow(
+    user: dict = Depends(get_current_user),
+    from_ts: Optional[datetime] = Query(None, alias="from"),
+    to_ts: Optional[datetime] = Query(None, alias="to"),
+    pair: Optional[str] = None,
+    dex: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+):
+    pa = _require_pyarrow()
+    query = _build_query(user["wallet_address"], from_ts, to_ts, pair, dex)
+    projection = {"_id": 0, **{field: 1 for field in _EXPORT_FIELDS}}
+    cursor = _export_rows(query, projection, limit, from_ts, to_ts)
+
+    def open_writer(sink, schema):
+        options = pa.ipc.IpcWriteOptions(compression="zstd")
+        return pa.ipc.new_stream(sink, schema, options=options)
+
+    headers = {"Content-Disposition": "attachment; filename=ops.arrows"}
+    return StreamingResponse(
+        _columnar_chunks(cursor, pa, open_writer),
+        media_type="application/vnd.apache.arrow.stream",
+        headers=headers,
+    )
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends
 
 from api.auth import get_current_user
 from api.errors import ApiException
+from api.ingest import invalidate_alert_window
 from api.responses import ok
 from api.schemas import SettingsPayload, SettingsResponse, WalletKeyPayload
 from core.config import get_settings as get_app_settings
@@ -31,6 +32,7 @@ async def get_settings(user: dict = Depends(get_current_user)):
             "dex_list": ["Uniswap", "SushiSwap", "Curve"],
             "pairs": ["ETH/USDT", "WBTC/ETH"],
             "scan_frequency_sec": 15,
+            "opportunity_alert_window_sec": 300,
             "updated_at": now_utc(),
         }
         await db.settings.insert_one(settings)
@@ -41,6 +43,7 @@ async def get_settings(user: dict = Depends(get_current_user)):
         dex_list=settings.get("dex_list", []),
         pairs=settings.get("pairs", []),
         scan_frequency_sec=settings.get("scan_frequency_sec", 15),
+        opportunity_alert_window_sec=settings.get("opportunity_alert_window_sec", 300),
         flash_loan_contract=settings.get("flash_loan_contract", ""),
         flash_loan_contract_abi_path=settings.get("flash_loan_contract_abi_path", ""),
         updated_at=settings.get("updated_at"),
@@ -52,7 +55,7 @@ async def get_settings(user: dict = Depends(get_current_user)):
 @router.put(
     "/settings",
     summary="Update bot settings",
-    description="Overwrites the user's strategy settings (profit threshold, loan limit, DEX list, trading pairs, scan frequency).",
+    description="Overwrites the user's strategy settings (profit threshold, loan limit, DEX list, trading pairs, scan frequency, opportunity alert window).",
     response_model=None,
 )
 async def update_settings(payload: SettingsPayload, user: dict = Depends(get_current_user)):
@@ -64,6 +67,7 @@ async def update_settings(payload: SettingsPayload, user: dict = Depends(get_cur
         {"$set": {**updated, "wallet_address": user["wallet_address"]}},
         upsert=True,
     )
+    invalidate_alert_window(user["wallet_address"])
     settings = await db.settings.find_one({"wallet_address": user["wallet_address"]})
     response = SettingsResponse(
         **updated,
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, Query, Request, WebSocket
+from fastapi.responses import StreamingResponse
+
+from api.auth import get_current_user, user_from_token
+from api.errors import ApiException
+from api.hub import hub
+from api.ratelimit import rate_limiter
+from api.services import bot_status_snapshot
+
+router = APIRouter(prefix="", tags=["stream"])
+
+KEEPALIVE_SECONDS = 15
+
+_EVENTS_DESCRIPTION = (
+    "Events, each `{type, data}`:\n\n"
+    "- `status` — bot state; the first event is a full `/bot/status` snapshot\n"
+    "- `kpis` — KPI increments from newly ingested ops (`current_profit`, `completed_deals`)\n"
+    "- `notification` — a new notification row\n"
+    "- `opportunity` — a new arbitrage opportunity\n"
+    "- `log` — a new log row"
+)
+
+
+def _sse_frame(message: dict) -> str:
+    return f"event: {message['type']}\ndata: {json.dumps(message['data'])}\n\n"
+
+
+async def _snapshot(wallet_address: str) -> dict:
+    return {"type": "status", "data": await bot_status_snapshot(wallet_address)}
+
+
+@router.get(
+    "/stream",
+    summary="Live event stream (SSE)",
+    description=(
+        "Server-Sent Events feed for the authenticated wallet, replacing dashboard polling. "
+        "`EventSource` can't send headers, so pass the JWT as `?token=...`. "
+        f"A comment line is sent every {KEEPALIVE_SECONDS}s to keep proxies from closing the connection.\n\n"
+        + _EVENTS_DESCRIPTION
+    ),
+    response_class=StreamingResponse,
+    dependencies=[Depends(rate_limiter())],
+)
+async def stream_events(request: Request, user: dict = Depends(get_current_user)):
+    wallet = user["wallet_address"]
+    queue = hub.subscribe(wallet)
+
+    async def _events():
+        try:
+            yield _sse_frame(await _snapshot(wallet))
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                yield _sse_frame(message)
+        finally:
+            hub.unsubscribe(wallet, queue)
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(_events(), media_type="text/event-stream", headers=headers)
+
+
+async def _wait_disconnect(websocket: WebSocket) -> None:
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+@router.websocket("/stream/ws")
+async def stream_socket(websocket: WebSocket, token: str = Query(...)):
+    """WebSocket variant of `/stream`; every frame is a JSON `{type, data}` message."""
+    try:
+        user = await user_from_token(token)
+    except ApiException:
+        await websocket.close(code=4401)
+        return
+    wallet = user["wallet_address"]
+    await websocket.accept()
+    queue = hub.subscribe(wallet)
+    disconnected = asyncio.create_task(_wait_disconnect(websocket))
+    try:
+        await websocket.send_json(await _snapshot(wallet))
+        while not disconnected.done():
+            getter = asyncio.create_task(queue.get())
+            done, _ = await asyncio.wait({getter, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                await websocket.send_json(getter.result())
+            else:
+                getter.cancel()
+    finally:
+        disconnected.cancel()
+        hub.unsubscribe(wallet, queue)
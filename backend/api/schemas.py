@@ -15,6 +15,7 @@ class ApiResponse(BaseModel):
     ok: bool
     data: Optional[Any] = None
     error: Optional[ApiError] = None
+    next_cursor: Optional[str] = None
 
 
 class LoginRequest(BaseModel):
@@ -43,6 +44,8 @@ class SettingsPayload(BaseModel):
     dex_list: list[str] = Field(default_factory=list)
     pairs: list[str] = Field(default_factory=list)
     scan_frequency_sec: int = 15
+    # Repeat alerts for the same route within this many seconds update one notification; 0 disables.
+    opportunity_alert_window_sec: int = Field(300, ge=0, le=86400)
     flash_loan_contract: str = ""
     flash_loan_contract_abi_path: str = ""
 
@@ -80,11 +83,22 @@ class OpRecord(BaseModel):
     error_message: Optional[str] = None
 
 
+class StatsGroup(BaseModel):
+    key: Optional[str] = None
+    ops_count: int
+    total_profit: float
+    successful_arbs: int
+    avg_profitability: float
+    success_rate: float
+
+
 class StatsSummary(BaseModel):
     total_profit: float
     successful_arbs: int
     avg_profitability: float
     success_rate: float
+    group_by: Optional[str] = None
+    groups: Optional[list[StatsGroup]] = None
 
 
 class Notification(BaseModel):
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+from datetime import timedelta
 from typing import Any
 
+from api.hub import publish
+from core import bot_control
+from core.bot_control import status_event
 from core.db import get_db
-from core.utils import now_utc
+from core.rollups import get_rollup, summarize
+from core.stream import shared_stream
+from core.utils import as_utc, now_utc
+from core.versions import bump_versions
 
 
 def format_doc(doc: dict) -> dict:
@@ -13,28 +20,61 @@ def format_doc(doc: dict) -> dict:
     return doc
 
 
-async def create_notification(wallet_address: str, ntype: str, title: str, message: str) -> None:
+def log_doc(wallet_address: str, level: str, message: str, context: dict | None = None) -> dict:
+    return {
+        "wallet_address": wallet_address,
+        "created_at": now_utc(),
+        "level": level,
+        "message": message,
+        "context": context or {},
+    }
+
+
+# Unread counters drift when the notifications TTL removes unread rows, so
+# they are recounted from the collection once they are this old.
+UNREAD_RECOUNT_AFTER = timedelta(hours=1)
+
+
+async def unread_count(wallet_address: str) -> int:
     db = get_db()
-    await db.notifications.insert_one(
-        {
-            "wallet_address": wallet_address,
-            "created_at": now_utc(),
-            "type": ntype,
-            "title": title,
-            "message": message,
-            "read": False,
-        }
-    )
-
-
-async def create_log(wallet_address: str, level: str, message: str, context: dict | None = None) -> None:
+    counter = await db.unread_counts.find_one({"_id": wallet_address})
+    recounted_at = counter.get("recounted_at") if counter else None
+    if recounted_at is None or as_utc(recounted_at) < now_utc() - UNREAD_RECOUNT_AFTER:
+        unread = await db.notifications.count_documents({"wallet_address": wallet_address, "read": False})
+        await db.unread_counts.update_one(
+            {"_id": wallet_address},
+            {"$set": {"unread": unread, "recounted_at": now_utc()}},
+            upsert=True,
+        )
+        if counter is None or counter.get("unread") != unread:
+            # Cached replies (ETags) carry the drifted count; move them on.
+            await bump_versions([wallet_address])
+        return unread
+    return max(counter.get("unread", 0), 0)
+
+
+def kpis_from_summary(summary: dict) -> dict:
+    return {
+        "current_profit": summary["total_profit"],
+        "completed_deals": summary["successful_arbs"],
+        "avg_profitability": summary["avg_profitability"],
+    }
+
+
+async def bot_status_snapshot(wallet_address: str) -> dict:
+    """Bot state plus KPIs from the wallet's op rollup (the `/bot/status` payload)."""
     db = get_db()
-    await db.logs.insert_one(
-        {
-            "wallet_address": wallet_address,
-            "created_at": now_utc(),
-            "level": level,
-            "message": message,
-            "context": context or {},
-        }
-    )
+    state = await db.bot_state.find_one({"wallet_address": wallet_address})
+    status = state.get("status") if state else "stopped"
+    last_error = state.get("last_error") if state else None
+    kpis = kpis_from_summary(summarize(await get_rollup(wallet_address)))
+    return {"status": status, "last_error": last_error, "kpis": kpis}
+
+
+async def control_bot(wallet_address: str, status: str) -> dict:
+    """core.bot_control.control_bot, plus delivery to this process's `/stream`
+    clients when events don't go through the shared relay."""
+    state = await bot_control.control_bot(wallet_address, status)
+    if not shared_stream():
+        await publish([status_event(state)])
+    return state
@@ -1,14 +1,40 @@
 from __future__ import annotations
 
+import asyncio
+import heapq
 import logging
+import time
+from collections import defaultdict
+from typing import Optional
 
 from aiogram import Bot
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
+from aiogram.exceptions import TelegramNetworkError, TelegramRetryAfter, TelegramServerError
 
+from core.cache import TTLCache
 from core.config import get_settings
 from core.db import get_db
 
+log = logging.getLogger(__name__)
+
+# Telegram flood limits: about 30 messages/s per bot and 1 message/s per chat.
+GLOBAL_INTERVAL = 1 / 30
+CHAT_INTERVAL = 1.0
+# How long a chat's first message waits for more to join its digest.
+DIGEST_DELAY = 1.0
+MAX_MESSAGE_CHARS = 4096
+MAX_PENDING_PER_WALLET = 50
+MAX_ATTEMPTS = 4
+WORKERS = 8
+# A wallet without a linked chat keeps its messages for this long, looking the
+# chat up again every UNLINKED_RETRY seconds (the bot process writes `chat_id`
+# on /start, so the link can appear at any moment).
+UNLINKED_KEEP = 600.0
+UNLINKED_RETRY = 15.0
+
+# Only found chats are cached; a missing link is looked up again on the next flush.
+_CHAT_CACHE_TTL = 300
 
 _bot: Bot | None = None
 
@@ -23,18 +49,221 @@ def get_bot() -> Bot | None:
     return _bot
 
 
-async def notify_wallet(wallet_address: str, message: str) -> None:
-    db = get_db()
-    mapping = await db.telegram_users.find_one({"wallet_address": wallet_address})
-    if not mapping:
-        return
-    bot = get_bot()
-    if not bot:
-        return
-    chat_id = mapping.get("chat_id")
-    if not chat_id:
+def _pieces(message: str):
+    """Split one message on line boundaries so no piece exceeds the limit."""
+    if len(message) <= MAX_MESSAGE_CHARS:
+        yield message
         return
-    try:
-        await bot.send_message(chat_id=chat_id, text=message)
-    except Exception as exc:  # pragma: no cover - best effort
-        logging.warning("Telegram notify failed: %s", exc)
+    current = ""
+    for line in message.split("\n"):
+        line = line[:MAX_MESSAGE_CHARS]  # only a single oversized line is ever cut
+        if current and len(current) + 1 + len(line) > MAX_MESSAGE_CHARS:
+            yield current
+            current = ""
+        current = f"{current}\n{line}" if current else line
+    if current:
+        yield current
+
+
+def digest_chunks(messages: list[str]) -> list[str]:
+    """Join queued messages into as few Telegram messages as fit the length limit.
+
+    Chunks break between messages (or, inside an oversized message, between
+    lines), never inside one, so HTML tags stay balanced.
+    """
+    chunks: list[str] = []
+    current = ""
+    for message in messages:
+        for piece in _pieces(message):
+            if current and len(current) + 2 + len(piece) > MAX_MESSAGE_CHARS:
+                chunks.append(current)
+                current = ""
+            current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class TelegramDispatcher:
+    """Background delivery of wallet notifications to their linked Telegram chats.
+
+    `enqueue` only appends to the wallet's pending list, so callers never wait
+    on Telegram. A wallet's first pending message schedules a flush
+    `DIGEST_DELAY` later on a due-time heap; the scheduler hands due wallets
+    to the workers, which send everything pending as one digest. A chat that
+    isn't free yet (per-chat pacing, `429 Retry-After`, transient errors) is
+    pushed back onto the heap rather than waited on, so workers only ever
+    block on the bot-wide send rate. Failures past `MAX_ATTEMPTS` drop the digest,
+    and so does a wallet that hasn't linked a chat within `UNLINKED_KEEP`.
+    """
+
+    def __init__(self, workers: int = WORKERS) -> None:
+        self.workers = workers
+        self._pending: dict[str, list[str]] = defaultdict(list)
+        self._due: list[tuple[float, str]] = []
+        self._scheduled: set[str] = set()
+        self._attempts: dict[str, int] = {}
+        self._unlinked_since: dict[str, float] = {}
+        self._ready: asyncio.Queue[str] = asyncio.Queue()
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._chat_ids = TTLCache(4096, ttl_seconds=_CHAT_CACHE_TTL)
+        self._next_global = 0.0
+        self._next_chat: dict[int, float] = {}
+        self._global_lock = asyncio.Lock()
+
+    def enqueue(self, wallet_address: str, message: str) -> None:
+        self.start()
+        pending = self._pending[wallet_address]
+        if not pending:
+            self._schedule(wallet_address, time.monotonic() + DIGEST_DELAY)
+        elif len(pending) >= MAX_PENDING_PER_WALLET:
+            del pending[0]
+        pending.append(message)
+
+    def invalidate_chat(self, wallet_address: str) -> None:
+        self._chat_ids.pop(wallet_address)
+
+    def _schedule(self, wallet_address: str, due: float) -> None:
+        if wallet_address in self._scheduled:
+            return
+        self._scheduled.add(wallet_address)
+        heapq.heappush(self._due, (due, wallet_address))
+        self._wakeup.set()
+
+    def start(self) -> None:
+        """Spawn the scheduler and workers on the running loop (no-op if they are running)."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._tasks and self._loop is loop:
+            return
+        self._loop = loop
+        self._ready = asyncio.Queue()
+        self._wakeup = asyncio.Event()
+        self._global_lock = asyncio.Lock()
+        self._due, self._scheduled = [], set()
+        now = time.monotonic()
+        for wallet in self._pending:
+            self._schedule(wallet, now)
+        self._tasks = [asyncio.create_task(self._scheduler())]
+        self._tasks += [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _chat_id(self, wallet_address: str) -> Optional[int]:
+        chat_id = self._chat_ids.get(wallet_address)
+        if chat_id is None:
+            db = get_db()
+            mapping = await db.telegram_users.find_one(
+                {"wallet_address": wallet_address, "chat_id": {"$ne": None}}, {"chat_id": 1}
+            )
+            chat_id = mapping.get("chat_id") if mapping else None
+            if chat_id:
+                self._chat_ids.set(wallet_address, chat_id)
+        return chat_id
+
+    async def _scheduler(self) -> None:
+        while True:
+            self._wakeup.clear()
+            now = time.monotonic()
+            while self._due and self._due[0][0] <= now:
+                _, wallet = heapq.heappop(self._due)
+                self._scheduled.discard(wallet)
+                self._ready.put_nowait(wallet)
+            timeout = self._due[0][0] - now if self._due else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _worker(self) -> None:
+        while True:
+            wallet = await self._ready.get()
+            try:
+                await self._deliver(wallet)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # pragma: no cover - best effort
+                log.warning("Telegram delivery failed for %s: %s", wallet, exc)
+            finally:
+                self._ready.task_done()
+
+    async def _deliver(self, wallet_address: str) -> None:
+        bot = get_bot()
+        if not bot:
+            self._pending.pop(wallet_address, None)
+            self._attempts.pop(wallet_address, None)
+            return
+        chat_id = await self._chat_id(wallet_address)
+        now = time.monotonic()
+        if not chat_id:
+            since = self._unlinked_since.setdefault(wallet_address, now)
+            if now - since >= UNLINKED_KEEP:
+                self._pending.pop(wallet_address, None)
+                self._attempts.pop(wallet_address, None)
+                del self._unlinked_since[wallet_address]
+            else:
+                self._schedule(wallet_address, now + UNLINKED_RETRY)
+            return
+        self._unlinked_since.pop(wallet_address, None)
+        slot = self._next_chat.get(chat_id, 0.0)
+        if slot > now:
+            # The chat isn't free yet; messages arriving meanwhile join this digest.
+            self._schedule(wallet_address, slot)
+            return
+        chunks = digest_chunks(self._pending.pop(wallet_address, []))
+        for index, text in enumerate(chunks):
+            self._next_chat[chat_id] = time.monotonic() + CHAT_INTERVAL
+            retry = await self._send(bot, chat_id, text, self._attempts.get(wallet_address, 0))
+            if retry is not None:
+                self._retry(wallet_address, chat_id, chunks[index:], retry)
+                return
+        self._attempts.pop(wallet_address, None)
+        if len(self._next_chat) > 10_000:
+            now = time.monotonic()
+            self._next_chat = {k: v for k, v in self._next_chat.items() if v > now}
+
+    def _retry(self, wallet_address: str, chat_id: int, unsent: list[str], delay: float) -> None:
+        attempts = self._attempts.get(wallet_address, 0) + 1
+        if attempts >= MAX_ATTEMPTS:
+            self._attempts.pop(wallet_address, None)
+            log.warning("Telegram notify to chat %s gave up after %d attempts", chat_id, MAX_ATTEMPTS)
+            return
+        self._attempts[wallet_address] = attempts
+        self._pending[wallet_address] = unsent + self._pending.get(wallet_address, [])
+        due = time.monotonic() + delay
+        self._next_chat[chat_id] = due
+        self._schedule(wallet_address, due)
+
+    async def _wait_global(self) -> None:
+        async with self._global_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_global)
+            self._next_global = slot + GLOBAL_INTERVAL
+        await asyncio.sleep(slot - now)
+
+    async def _send(self, bot: Bot, chat_id: int, text: str, attempt: int) -> Optional[float]:
+        """Send one message; returns the delay before a retry, or None once sent."""
+        await self._wait_global()
+        try:
+            await bot.send_message(chat_id=chat_id, text=text)
+        except TelegramRetryAfter as exc:
+            return exc.retry_after + CHAT_INTERVAL
+        except (TelegramNetworkError, TelegramServerError):
+            return 2 ** attempt
+        return None
+
+
+dispatcher = TelegramDispatcher()
+
+
+def notify_wallet(wallet_address: str, message: str) -> None:
+    """Queue `message` for the wallet's linked chat; returns immediately."""
+    dispatcher.enqueue(wallet_address, message)
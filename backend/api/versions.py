@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from fastapi import Depends, Request, Response
+
+from api.auth import get_current_user
+from api.errors import NotModified
+from core.utils import hash_token
+from core.versions import get_version
+
+
+async def conditional_get(request: Request, response: Response, user: dict = Depends(get_current_user)) -> None:
+    """Answer `304 Not Modified` when `If-None-Match` carries the wallet's current version.
+
+    The version is read before the route's own reads, so a write landing in
+    between leaves the ETag behind the data and only costs one extra full reply.
+    """
+    # The wallet hash keeps tags distinct across accounts sharing a browser cache.
+    wallet = user["wallet_address"]
+    etag = f'W/"{hash_token(wallet.lower())[:12]}-{await get_version(wallet)}"'
+    if etag in (tag.strip() for tag in request.headers.get("if-none-match", "").split(",")):
+        raise NotModified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    response.headers["Vary"] = "Authorization"
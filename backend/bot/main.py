@@ -8,7 +8,7 @@ from aiogram.filters import Command
 from aiogram.filters.command import CommandStart
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
-from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.pymongo import PyMongoStorage
 from aiogram.types import (
     BotCommand,
     KeyboardButton,
@@ -17,9 +17,13 @@ from aiogram.types import (
     ReplyKeyboardMarkup,
     WebAppInfo,
 )
+from pymongo import AsyncMongoClient
 
+from core.bot_control import control_bot
 from core.config import get_settings
 from core.db import get_db
+from core.rollups import get_rollup
+from core.telegram_users import wallet_for_user
 from core.utils import now_utc
 
 router = Router()
@@ -38,9 +42,7 @@ class ThresholdState(StatesGroup):
 
 
 async def get_wallet(telegram_user_id: int) -> str | None:
-    db = get_db()
-    mapping = await db.telegram_users.find_one({"telegram_user_id": telegram_user_id})
-    return mapping.get("wallet_address") if mapping else None
+    return await wallet_for_user(telegram_user_id)
 
 
 @router.message(CommandStart())
@@ -83,12 +85,7 @@ async def start_bot_handler(message: Message) -> None:
     if not wallet:
         await message.answer("Connect your wallet in the Mini App first.")
         return
-    db = get_db()
-    await db.bot_state.update_one(
-        {"wallet_address": wallet},
-        {"$set": {"status": "active", "last_change_at": now_utc(), "last_error": None}},
-        upsert=True,
-    )
+    await control_bot(wallet, "active")
     await message.answer("Bot started. Monitoring is active.")
 
 
@@ -98,12 +95,7 @@ async def stop_bot_handler(message: Message) -> None:
     if not wallet:
         await message.answer("Connect your wallet in the Mini App first.")
         return
-    db = get_db()
-    await db.bot_state.update_one(
-        {"wallet_address": wallet},
-        {"$set": {"status": "stopped", "last_change_at": now_utc()}},
-        upsert=True,
-    )
+    await control_bot(wallet, "stopped")
     await message.answer("Bot stopped.")
 
 
@@ -114,9 +106,12 @@ async def bot_status_handler(message: Message) -> None:
         await message.answer("Connect your wallet in the Mini App first.")
         return
     db = get_db()
-    state = await db.bot_state.find_one({"wallet_address": wallet})
+    state, rollup = await asyncio.gather(
+        db.bot_state.find_one({"wallet_address": wallet}),
+        get_rollup(wallet),
+    )
     status = state.get("status", "stopped") if state else "stopped"
-    ops_count = await db.ops.count_documents({"wallet_address": wallet})
+    ops_count = rollup.get("ops_count", 0)
     text = f"<b>Status:</b> {status}\n<b>Total operations:</b> {ops_count}"
     if state and state.get("last_error"):
         text += f"\n<b>Last error:</b> {state['last_error']}"
@@ -154,14 +149,28 @@ async def threshold_value_handler(message: Message, state: FSMContext) -> None:
     await message.answer(f"Threshold updated to {value}%.")
 
 
-async def main() -> None:
+def create_bot() -> Bot:
     settings = get_settings()
     if not settings.bot_token:
         raise RuntimeError("BOT_TOKEN is not set")
+    return Bot(token=settings.bot_token, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
 
-    bot = Bot(token=settings.bot_token, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
-    dp = Dispatcher(storage=MemoryStorage())
+
+def create_dispatcher() -> Dispatcher:
+    """Dispatcher with FSM state in Mongo, so replicas share conversations and restarts keep them."""
+    settings = get_settings()
+    storage = PyMongoStorage(
+        AsyncMongoClient(settings.mongo_url, tz_aware=True),
+        db_name=get_db().name,
+        collection_name="fsm_states",
+    )
+    dp = Dispatcher(storage=storage)
     dp.include_router(router)
+    return dp
+
+
+async def setup_bot(bot: Bot) -> None:
+    settings = get_settings()
     await bot.set_my_commands(
         [
             BotCommand(command="start", description="Open the menu"),
@@ -172,9 +181,23 @@ async def main() -> None:
     await bot.set_chat_menu_button(
         menu_button=MenuButtonWebApp(text="Open App", web_app=WebAppInfo(url=miniapp_url))
     )
+
+
+async def main() -> None:
+    bot = create_bot()
+    dp = create_dispatcher()
+    await setup_bot(bot)
+    # Telegram refuses getUpdates while a webhook is registered.
+    await bot.delete_webhook()
     await dp.start_polling(bot)
 
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
-    asyncio.run(main())
+    settings = get_settings()
+    if settings.bot_webhook_url:
+        import uvicorn
+
+        uvicorn.run("bot.webhook:app", host="0.0.0.0", port=settings.bot_webhook_port)
+    else:
+        asyncio.run(main())
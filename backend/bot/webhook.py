@@ -0,0 +1,95 @@
+"""Webhook mode for the Telegram bot.
+
+With `BOT_WEBHOOK_URL` set, Telegram POSTs updates to `/telegram/webhook`
+instead of the bot long-polling, so any number of replicas can serve them
+(FSM state lives in Mongo). The endpoint is mounted into the API, or served
+standalone by `python -m bot.main` (`uvicorn bot.webhook:app`).
+"""
+from __future__ import annotations
+
+import asyncio
+import hmac
+import logging
+from typing import Optional
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from fastapi import APIRouter, FastAPI, Header, HTTPException, Request
+
+from bot.main import create_bot, create_dispatcher, setup_bot
+from core.config import get_settings
+
+log = logging.getLogger(__name__)
+
+router = APIRouter(prefix="", tags=["telegram"])
+
+_bot: Bot | None = None
+_dp: Dispatcher | None = None
+# Updates are acknowledged right away and processed in the background.
+_tasks: set[asyncio.Task] = set()
+
+
+def _runtime() -> tuple[Bot, Dispatcher]:
+    global _bot, _dp
+    if _bot is None or _dp is None:
+        _bot, _dp = create_bot(), create_dispatcher()
+    return _bot, _dp
+
+
+async def _process(bot: Bot, dp: Dispatcher, update: Update) -> None:
+    try:
+        await dp.feed_update(bot, update)
+    except Exception:  # pragma: no cover - handler errors are logged, not retried
+        log.exception("Failed to process update %s", update.update_id)
+
+
+@router.post("/telegram/webhook", include_in_schema=False)
+async def telegram_webhook(
+    request: Request,
+    x_telegram_bot_api_secret_token: Optional[str] = Header(None),
+):
+    secret = get_settings().bot_webhook_secret
+    if not hmac.compare_digest(x_telegram_bot_api_secret_token or "", secret):
+        # Same `{code, message}` detail as the API's errors, so its handler renders the usual envelope.
+        raise HTTPException(status_code=401, detail={"code": "AUTH_INVALID", "message": "Invalid webhook secret"})
+    bot, dp = _runtime()
+    update = Update.model_validate(await request.json(), context={"bot": bot})
+    task = asyncio.create_task(_process(bot, dp, update))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return {"ok": True, "data": None}
+
+
+async def register_webhook() -> None:
+    settings = get_settings()
+    if not settings.bot_webhook_secret:
+        raise RuntimeError("BOT_WEBHOOK_SECRET is not set")
+    bot, dp = _runtime()
+    await setup_bot(bot)
+    await bot.set_webhook(
+        settings.bot_webhook_url,
+        secret_token=settings.bot_webhook_secret,
+        allowed_updates=dp.resolve_used_update_types(),
+    )
+
+
+async def close_webhook() -> None:
+    if _tasks:
+        await asyncio.wait(_tasks, timeout=10)
+    if _bot is not None:
+        await _bot.session.close()
+
+
+app = FastAPI(title="ØNE-ARB bot webhook", docs_url=None, redoc_url=None, openapi_url=None)
+app.include_router(router)
+
+
+@app.on_event("startup")
+async def startup() -> None:
+    logging.basicConfig(level=logging.INFO)
+    await register_webhook()
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    await close_webhook()
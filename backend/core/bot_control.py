@@ -0,0 +1,76 @@
+"""Start / stop of a wallet's trading bot, shared by the API and the Telegram bot.
+
+A change is one `find_one_and_update` on `bot_state`, recorded in
+`bot_events` so the DEX monitor can pick it up right away through
+`GET /internal/bot-events` instead of on its next `/internal/active-users` poll.
+Everything `control_bot` writes is shared state (Mongo, wallet versions, the
+`stream_events` relay), so it behaves the same from any process.
+"""
+from __future__ import annotations
+
+from pymongo import ReturnDocument
+
+from core.db import get_db
+from core.notifications import create_notification
+from core.sequences import reserve_seq
+from core.stream import append_stream_events, shared_stream
+from core.trading_adapter import get_adapter
+from core.utils import now_utc
+from core.versions import bump_versions
+
+# Sequence numbering `bot_events`; API workers and the bot both insert, so
+# readers page on `seq` rather than `_id` (see core.sequences).
+BOT_EVENTS_SEQ = "bot_events"
+
+
+async def set_bot_status(wallet_address: str, status: str) -> dict:
+    """Move the wallet's bot to `active` or `stopped`. Returns the new `bot_state` document."""
+    db = get_db()
+    adapter = get_adapter()
+    now = now_utc()
+    if status == "active":
+        settings = await db.settings.find_one({"wallet_address": wallet_address}) or {}
+        adapter.start(wallet_address, settings)
+        update = {"status": "active", "last_change_at": now, "last_error": None}
+    else:
+        adapter.stop(wallet_address)
+        update = {"status": "stopped", "last_change_at": now}
+    state = await db.bot_state.find_one_and_update(
+        {"wallet_address": wallet_address},
+        {"$set": update},
+        projection={"_id": 0},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    seq = await reserve_seq(BOT_EVENTS_SEQ)
+    await db.bot_events.insert_one(
+        {"seq": seq, "wallet_address": wallet_address, "status": state["status"], "created_at": now}
+    )
+    return state
+
+
+_CONTROL_NOTICES = {
+    "active": ("Bot started", "Monitoring enabled"),
+    "stopped": ("Bot stopped", "Monitoring paused"),
+}
+
+
+def status_event(state: dict) -> tuple[str, str, dict]:
+    """The `/stream` `status` event for a `bot_state` document."""
+    return (state["wallet_address"], "status", {"status": state["status"], "last_error": state.get("last_error")})
+
+
+async def control_bot(wallet_address: str, status: str) -> dict:
+    """Start or stop the bot and notify the wallet's app and feeds.
+
+    The `status` event goes through the shared `stream_events` relay; with the
+    in-memory stream backend it only reaches clients of the API process that
+    publishes it (see api.services.control_bot).
+    """
+    state = await set_bot_status(wallet_address, status)
+    title, message = _CONTROL_NOTICES[state["status"]]
+    await create_notification(wallet_address, "info", title, message)
+    await bump_versions([wallet_address])
+    if shared_stream():
+        await append_stream_events([status_event(state)])
+    return state
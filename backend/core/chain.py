@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import Web3
+
+from core.cache import TTLCache
+from core.config import get_settings
+
+log = logging.getLogger(__name__)
+
+# A cached gas price is reused for about half a block.
+GAS_PRICE_TTL = 5
+REQUEST_TIMEOUT = 120
+
+# One client per RPC URL for the whole process, each on its own keep-alive
+# session, so deploy calls skip the TCP/TLS handshake. Used from the deploy
+# executor threads, hence the lock.
+_lock = threading.Lock()
+_clients: dict[str, Web3] = {}
+_sessions: dict[str, requests.Session] = {}
+_chain_ids: dict[str, int] = {}
+_gas_prices = TTLCache(64, ttl_seconds=GAS_PRICE_TTL)
+_warm_up: asyncio.Future | None = None
+
+
+def get_web3(rpc_url: str) -> Web3:
+    with _lock:
+        w3 = _clients.get(rpc_url)
+        if w3 is None:
+            # Enough pooled connections for every deploy thread plus a receipt poll each.
+            pool_size = max(4, get_settings().deploy_workers * 2)
+            session = requests.Session()
+            session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+            w3 = Web3(Web3.HTTPProvider(rpc_url, request_kwargs={"timeout": REQUEST_TIMEOUT}, session=session))
+            _clients[rpc_url] = w3
+            _sessions[rpc_url] = session
+        return w3
+
+
+def get_chain_id(rpc_url: str) -> int:
+    """The endpoint's chain id; it never changes, so it is fetched once."""
+    chain_id = _chain_ids.get(rpc_url)
+    if chain_id is None:
+        chain_id = get_web3(rpc_url).eth.chain_id
+        _chain_ids[rpc_url] = chain_id
+    return chain_id
+
+
+def get_gas_price(rpc_url: str) -> int:
+    with _lock:
+        gas_price = _gas_prices.get(rpc_url)
+    if gas_price is None:
+        gas_price = get_web3(rpc_url).eth.gas_price
+        with _lock:
+            _gas_prices.set(rpc_url, gas_price)
+    return gas_price
+
+
+def rpc_batch(rpc_url: str, calls: list[tuple[str, list]]) -> list:
+    """Send `calls` (method, params) as one JSON-RPC batch request.
+
+    Returns each call's result in order; a call the node answered with an error
+    gets a `RuntimeError` in its place. Endpoints that don't accept batches
+    (an error status or a non-list body) are asked one call at a time.
+    """
+    get_web3(rpc_url)
+    session = _sessions[rpc_url]
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+        for i, (method, params) in enumerate(calls)
+    ]
+    response = session.post(rpc_url, json=payload, timeout=REQUEST_TIMEOUT)
+    try:
+        replies = response.json() if response.ok else None
+    except ValueError:
+        replies = None
+    if not isinstance(replies, list):
+        replies = []
+        for item in payload:
+            single = session.post(rpc_url, json=item, timeout=REQUEST_TIMEOUT)
+            single.raise_for_status()
+            replies.append(single.json())
+    by_id = {reply.get("id"): reply for reply in replies if isinstance(reply, dict)}
+    results = []
+    for i, (method, _) in enumerate(calls):
+        reply = by_id.get(i)
+        if reply is None or "error" in reply:
+            detail = (reply or {}).get("error", "no reply")
+            results.append(RuntimeError(f"{method} failed: {detail}"))
+        else:
+            results.append(reply["result"])
+    return results
+
+
+def preflight(rpc_url: str, address: str) -> tuple[int, int, int, int]:
+    """Chain id, gas price, nonce and balance of `address` in one round trip
+    (chain id and gas price come from the caches when they are warm)."""
+    chain_id = _chain_ids.get(rpc_url)
+    with _lock:
+        gas_price = _gas_prices.get(rpc_url)
+    calls = [
+        ("eth_getTransactionCount", [address, "latest"]),
+        ("eth_getBalance", [address, "latest"]),
+    ]
+    if chain_id is None:
+        calls.append(("eth_chainId", []))
+    if gas_price is None:
+        calls.append(("eth_gasPrice", []))
+    results = rpc_batch(rpc_url, calls)
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+    values = dict(zip((method for method, _ in calls), (int(result, 16) for result in results)))
+    if chain_id is None:
+        chain_id = _chain_ids[rpc_url] = values["eth_chainId"]
+    if gas_price is None:
+        gas_price = values["eth_gasPrice"]
+        with _lock:
+            _gas_prices.set(rpc_url, gas_price)
+    return chain_id, gas_price, values["eth_getTransactionCount"], values["eth_getBalance"]
+
+
+def _connect(rpc_url: str) -> None:
+    try:
+        get_chain_id(rpc_url)
+        get_gas_price(rpc_url)
+    except Exception as exc:
+        log.warning("RPC warm-up for deploys failed: %s", exc)
+
+
+def warm_up(rpc_url: str) -> None:
+    """Open the connection to `rpc_url` in the background (called at startup)
+    so the first deploy doesn't pay for the handshake and the chain id lookup."""
+    global _warm_up
+    if rpc_url and _warm_up is None:
+        _warm_up = asyncio.get_running_loop().run_in_executor(None, _connect, rpc_url)
@@ -20,6 +20,20 @@ class Settings:
     deploy_rpc_url: str
     deploy_network: str
     flash_loan_abi_path: str
+    deploy_workers: int
+    index_audit: bool
+    opportunities_ttl_days: int
+    logs_ttl_days: int
+    notifications_ttl_days: int
+    ops_archive_after_days: int
+    user_cache_ttl_seconds: int
+    rate_limit_backend: str
+    rate_limits: str
+    stream_backend: str
+    bot_webhook_url: str
+    bot_webhook_secret: str
+    bot_webhook_port: int
+    bot_webhook_in_api: bool
 
 
 _cached_settings: Settings | None = None
@@ -47,5 +61,19 @@ def get_settings() -> Settings:
         deploy_rpc_url=os.getenv("DEPLOY_RPC_URL") or os.getenv("ETH_RPC_URL", ""),
         deploy_network=os.getenv("DEPLOY_NETWORK", "mainnet"),
         flash_loan_abi_path=os.getenv("FLASH_LOAN_ABI_PATH", ""),
+        deploy_workers=max(1, int(os.getenv("DEPLOY_WORKERS", "2"))),
+        index_audit=os.getenv("INDEX_AUDIT", "").lower() in ("1", "true", "yes"),
+        opportunities_ttl_days=int(os.getenv("OPPORTUNITIES_TTL_DAYS", "1")),
+        logs_ttl_days=int(os.getenv("LOGS_TTL_DAYS", "30")),
+        notifications_ttl_days=int(os.getenv("NOTIFICATIONS_TTL_DAYS", "90")),
+        ops_archive_after_days=int(os.getenv("OPS_ARCHIVE_AFTER_DAYS", "180")),
+        user_cache_ttl_seconds=int(os.getenv("USER_CACHE_TTL_SECONDS", "30")),
+        rate_limit_backend=os.getenv("RATE_LIMIT_BACKEND", "memory").lower(),
+        rate_limits=os.getenv("RATE_LIMITS", ""),
+        stream_backend=os.getenv("STREAM_BACKEND", "memory").lower(),
+        bot_webhook_url=os.getenv("BOT_WEBHOOK_URL", ""),
+        bot_webhook_secret=os.getenv("BOT_WEBHOOK_SECRET", ""),
+        bot_webhook_port=int(os.getenv("BOT_WEBHOOK_PORT", "8090")),
+        bot_webhook_in_api=os.getenv("BOT_WEBHOOK_IN_API", "").lower() in ("1", "true", "yes"),
     )
     return _cached_settings
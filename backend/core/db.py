@@ -1,12 +1,28 @@
 from __future__ import annotations
 
+import logging
+from datetime import timedelta
+
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import OperationFailure
 
 from core.config import get_settings
+from core.utils import now_utc
 
 
 _client: AsyncIOMotorClient | None = None
 
+log = logging.getLogger(__name__)
+
+# Single-field indexes superseded by the compound ones below.
+_LEGACY_INDEXES = {
+    "ops": "wallet_address_1",
+    "notifications": "wallet_address_1",
+    "logs": "wallet_address_1",
+}
+
+_AUDIT_WALLET = "0x0000000000000000000000000000000000000000"
+
 
 def get_client() -> AsyncIOMotorClient:
     global _client
@@ -25,10 +41,123 @@ async def init_indexes() -> None:
     db = get_db()
     await db.users.create_index("wallet_address", unique=True)
     await db.settings.create_index("wallet_address", unique=True)
-    await db.ops.create_index("wallet_address")
-    await db.notifications.create_index("wallet_address")
-    await db.logs.create_index("wallet_address")
+    # Newest-first listings page on (sort key, _id); see api.pagination.
+    await db.ops.create_index([("wallet_address", 1), ("timestamp", -1), ("_id", -1)])
+    await db.ops.create_index([("wallet_address", 1), ("pair", 1), ("timestamp", -1), ("_id", -1)])
+    await db.ops.create_index([("wallet_address", 1), ("dex", 1), ("timestamp", -1), ("_id", -1)])
+    await db.op_rollups.create_index("wallet_address", unique=True)
+    await db.op_buckets.create_index(
+        [("wallet_address", 1), ("granularity", 1), ("start", 1), ("pair", 1), ("dex", 1), ("status", 1)],
+        unique=True,
+    )
+    await db.notifications.create_index([("wallet_address", 1), ("created_at", -1), ("_id", -1)])
+    # Unread recounts; see api.services.unread_count.
+    await db.notifications.create_index(
+        "wallet_address", name="wallet_address_unread", partialFilterExpression={"read": False}
+    )
+    # One open opportunity alert window per route; see api.ingest._alert_update.
+    await db.notifications.create_index(
+        [("wallet_address", 1), ("group_key", 1), ("window_open", 1)],
+        unique=True,
+        partialFilterExpression={"window_open": True},
+    )
+    await db.logs.create_index([("wallet_address", 1), ("created_at", -1), ("_id", -1)])
     await db.bot_state.create_index("wallet_address", unique=True)
+    await db.bot_state.create_index(
+        [("status", 1), ("wallet_address", 1)],
+        partialFilterExpression={"status": "active"},
+    )
     await db.opportunities.create_index([("wallet_address", 1), ("timestamp", -1)])
     await db.telegram_users.create_index("telegram_user_id", unique=True)
     await db.telegram_users.create_index("wallet_address")
+    await db.rate_limits.create_index("expires_at", expireAfterSeconds=0)
+    # Bot start/stop events only need to live until the monitor has read them; see core.bot_control.
+    await db.bot_events.create_index("created_at", expireAfterSeconds=86400)
+    await db.bot_events.create_index("seq", unique=True, partialFilterExpression={"seq": {"$exists": True}})
+    # One running deploy per wallet; finished jobs drop `active` and expire after 30 days.
+    await db.deploy_jobs.create_index(
+        "wallet_address", unique=True, name="wallet_address_active",
+        partialFilterExpression={"active": True},
+    )
+    await db.deploy_jobs.create_index("created_at", expireAfterSeconds=30 * 86400)
+
+    settings = get_settings()
+    await _ensure_ttl_index(db.opportunities, "timestamp", settings.opportunities_ttl_days)
+    await _ensure_ttl_index(db.logs, "created_at", settings.logs_ttl_days)
+    await _ensure_ttl_index(db.notifications, "created_at", settings.notifications_ttl_days)
+
+    for collection, name in _LEGACY_INDEXES.items():
+        try:
+            await db[collection].drop_index(name)
+        except OperationFailure:
+            pass  # already dropped or never created
+
+
+async def _ensure_ttl_index(collection, field: str, days: int) -> None:
+    """Create, retune or (for `days <= 0`) drop the TTL index on `field`."""
+    name = f"{field}_ttl"
+    if days <= 0:
+        try:
+            await collection.drop_index(name)
+        except OperationFailure:
+            pass
+        return
+    seconds = days * 86400
+    try:
+        await collection.create_index(field, name=name, expireAfterSeconds=seconds)
+    except OperationFailure:
+        # Index exists with another expiry; change it in place.
+        await collection.database.command(
+            "collMod", collection.name, index={"name": name, "expireAfterSeconds": seconds}
+        )
+
+
+def _canonical_queries(db) -> list[tuple[str, object]]:
+    """The hot query shape of each router, as unexecuted cursors."""
+    wallet = {"wallet_address": _AUDIT_WALLET}
+    newest = [("timestamp", -1), ("_id", -1)]
+    newest_created = [("created_at", -1), ("_id", -1)]
+    since = now_utc() - timedelta(days=7)
+    return [
+        ("reports.ops", db.ops.find(wallet).sort(newest).limit(200)),
+        ("reports.ops?pair", db.ops.find({**wallet, "pair": "ETH/USDT"}).sort(newest).limit(200)),
+        ("reports.ops?dex", db.ops.find({**wallet, "dex": "Uniswap"}).sort(newest).limit(200)),
+        ("reports.stats_summary.edges", db.ops.find({**wallet, "timestamp": {"$gte": since}})),
+        ("reports.stats_summary.buckets", db.op_buckets.find({**wallet, "granularity": "day", "start": {"$gte": since}})),
+        ("notifications.list", db.notifications.find(wallet).sort(newest_created).limit(20)),
+        ("logs.recent", db.logs.find(wallet).sort(newest_created).limit(20)),
+        ("market.opportunities", db.latest_opportunities.find({"_id": _AUDIT_WALLET}).limit(1)),
+        ("internal.active_users", db.bot_state.find({"status": "active"}, {"_id": 0, "wallet_address": 1})),
+        ("bot.status", db.bot_state.find(wallet).limit(1)),
+        ("profile.rollup", db.op_rollups.find(wallet).limit(1)),
+    ]
+
+
+def _plan_stages(plan) -> set[str]:
+    stages: set[str] = set()
+    if isinstance(plan, dict):
+        if isinstance(plan.get("stage"), str):
+            stages.add(plan["stage"])
+        for value in plan.values():
+            stages |= _plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            stages |= _plan_stages(item)
+    return stages
+
+
+async def audit_indexes() -> None:
+    """Explain each canonical query and warn about collection scans or in-memory sorts."""
+    db = get_db()
+    for name, cursor in _canonical_queries(db):
+        try:
+            explain = await cursor.explain()
+        except OperationFailure as exc:
+            log.warning("Index audit: explain failed for %s: %s", name, exc)
+            continue
+        stages = _plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {}))
+        bad = stages & {"COLLSCAN", "SORT"}
+        if bad:
+            log.warning("Index audit: %s uses %s (plan stages: %s)", name, "/".join(sorted(bad)), sorted(stages))
+        else:
+            log.info("Index audit: %s ok (%s)", name, ", ".join(sorted(stages)))
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from pymongo import UpdateOne
+
+from core.db import get_db
+from core.utils import now_utc
+
+
+def notification_doc(wallet_address: str, ntype: str, title: str, message: str) -> dict:
+    return {
+        "wallet_address": wallet_address,
+        "created_at": now_utc(),
+        "type": ntype,
+        "title": title,
+        "message": message,
+        "read": False,
+    }
+
+
+async def add_unread(counts: dict[str, int]) -> None:
+    """Adjust per-wallet unread notification counters by the given deltas."""
+    writes = [
+        UpdateOne({"_id": wallet}, {"$inc": {"unread": delta}}, upsert=True)
+        for wallet, delta in counts.items()
+        if delta
+    ]
+    if writes:
+        await get_db().unread_counts.bulk_write(writes, ordered=False)
+
+
+async def create_notification(wallet_address: str, ntype: str, title: str, message: str) -> None:
+    db = get_db()
+    await db.notifications.insert_one(notification_doc(wallet_address, ntype, title, message))
+    await add_unread({wallet_address: 1})
@@ -0,0 +1,131 @@
+"""Rollover of old ops into monthly archive collections.
+
+Ops older than `OPS_ARCHIVE_AFTER_DAYS` (rounded down to a month boundary)
+are moved into `ops_archive_YYYY_MM` so the hot `ops` collection and its
+indexes stay small. Rollups and stats buckets are unaffected, and their
+rebuild and edge-hour reads include the archives, as do `/ops` and the exports.
+
+    python -m core.retention archive [--older-than-days N]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Optional
+
+from pymongo.errors import BulkWriteError
+
+from core.config import get_settings
+from core.db import get_db
+from core.utils import as_utc, now_utc
+
+ARCHIVE_PREFIX = "ops_archive_"
+
+_ARCHIVE_BATCH = 1000
+
+
+def archive_name(ts: datetime) -> str:
+    ts = as_utc(ts)
+    return f"{ARCHIVE_PREFIX}{ts.year:04d}_{ts.month:02d}"
+
+
+def archive_names_between(lo: datetime, hi: datetime) -> list[str]:
+    """Archive collections that may hold ops in `[lo, hi]`.
+
+    The current month is never archived, so it is left out.
+    """
+    current = archive_name(now_utc())
+    names = []
+    year, month = as_utc(lo).year, as_utc(lo).month
+    end = (as_utc(hi).year, as_utc(hi).month)
+    while (year, month) <= end:
+        name = f"{ARCHIVE_PREFIX}{year:04d}_{month:02d}"
+        if name >= current:
+            break
+        names.append(name)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return names
+
+
+async def archive_collections(db) -> list[str]:
+    names = await db.list_collection_names(filter={"name": {"$regex": f"^{ARCHIVE_PREFIX}"}})
+    return sorted(names)
+
+
+async def archives_in_range(db, lo: Optional[datetime], hi: Optional[datetime]) -> list[str]:
+    """Existing archive collections that may hold ops in `[lo, hi]`, newest month first."""
+    names = await archive_collections(db)
+    if lo is not None:
+        names = [name for name in names if name >= archive_name(lo)]
+    if hi is not None:
+        names = [name for name in names if name <= archive_name(hi)]
+    return names[::-1]
+
+
+def _month_start(ts: datetime) -> datetime:
+    return as_utc(ts).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+async def archive_ops(older_than_days: int) -> dict[str, int]:
+    """Move ops older than the cutoff month into monthly archives. Returns moved counts by collection.
+
+    Each batch is inserted before it is deleted, so an interrupted run can
+    simply be repeated; rows already present in an archive are skipped.
+    """
+    db = get_db()
+    cutoff = _month_start(now_utc() - timedelta(days=older_than_days))
+    moved: dict[str, int] = defaultdict(int)
+    indexed: set[str] = set()
+
+    while True:
+        batch = await (
+            db.ops.find({"timestamp": {"$lt": cutoff, "$type": "date"}})
+            .sort("_id", 1)
+            .limit(_ARCHIVE_BATCH)
+            .to_list(length=_ARCHIVE_BATCH)
+        )
+        if not batch:
+            break
+        by_month: dict[str, list[dict]] = defaultdict(list)
+        for op in batch:
+            by_month[archive_name(op["timestamp"])].append(op)
+        for name, docs in by_month.items():
+            if name not in indexed:
+                await db[name].create_index([("wallet_address", 1), ("timestamp", -1)])
+                indexed.add(name)
+            try:
+                await db[name].insert_many(docs, ordered=False)
+            except BulkWriteError as exc:
+                if any(err.get("code") != 11000 for err in exc.details.get("writeErrors", [])):
+                    raise
+            moved[name] += len(docs)
+        await db.ops.delete_many({"_id": {"$in": [op["_id"] for op in batch]}})
+
+    return dict(moved)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m core.retention")
+    commands = parser.add_subparsers(dest="command", required=True)
+    archive = commands.add_parser("archive", help="Move old ops into monthly archive collections")
+    archive.add_argument(
+        "--older-than-days",
+        type=int,
+        default=get_settings().ops_archive_after_days,
+        help="Archive ops older than this many days (default: OPS_ARCHIVE_AFTER_DAYS)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    moved = asyncio.run(archive_ops(args.older_than_days))
+    for name, count in sorted(moved.items()):
+        logging.info("Archived %d op(s) into %s", count, name)
+    if not moved:
+        logging.info("Nothing to archive")
+
+
+if __name__ == "__main__":
+    main()
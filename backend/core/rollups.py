@@ -0,0 +1,467 @@
+"""Per-wallet KPI rollups maintained incrementally from ingested ops.
+
+Each wallet has one `op_rollups` document holding running sums over its
+`ops`, so KPI reads are a single indexed point lookup instead of a scan.
+`op_buckets` holds the same sums per hour and per day for every
+(wallet, pair, dex, status), which answers filtered date-range summaries.
+
+Ops stored before rollups existed are added once, in the background, the
+first time the API starts (see `backfill_rollups`). Rebuild both from raw ops
+(e.g. after a backfill; legacy string timestamps are rewritten as dates first)::
+
+    python -m core.rollups rebuild [--wallet 0x...]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from bson import ObjectId
+from pymongo import InsertOne, ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from core.db import get_db
+from core.retention import archive_collections, archive_names_between
+from core.utils import as_utc, now_utc
+
+ROLLUP_FIELDS = ("ops_count", "success_count", "total_profit", "total_fees", "exec_time_ms_sum")
+
+BUCKET_STEPS = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+
+_REBUILD_BATCH = 500
+
+BACKFILL_MARKER = "op_rollups_backfill"
+# A claimed backfill not finished within this long is taken over by the next start.
+_BACKFILL_CLAIM_TTL = timedelta(hours=1)
+_DUPLICATE_KEY = 11000
+_backfill_task: asyncio.Task | None = None
+
+log = logging.getLogger(__name__)
+
+
+def rollup_increments(op: dict) -> dict:
+    """`$inc` document that adds a single op to its wallet's rollup."""
+    success = op.get("status") == "success"
+    return {
+        "ops_count": 1,
+        "success_count": 1 if success else 0,
+        "total_profit": float(op.get("profit", 0)) if success else 0.0,
+        "total_fees": float(op.get("fees", 0)),
+        "exec_time_ms_sum": int(op.get("exec_time_ms", 0)),
+    }
+
+
+def merge_increments(total: dict, inc: dict) -> dict:
+    for key, value in inc.items():
+        total[key] = total.get(key, 0) + value
+    return total
+
+
+def rollup_update(inc: dict) -> dict:
+    return {"$inc": inc, "$set": {"updated_at": now_utc()}}
+
+
+async def get_rollup(wallet_address: str) -> dict:
+    db = get_db()
+    rollup = await db.op_rollups.find_one({"wallet_address": wallet_address}, {"_id": 0})
+    return rollup or {"wallet_address": wallet_address}
+
+
+def summarize(rollup: dict) -> dict:
+    """Stats summary (`/stats/summary` shape) from rollup-style sums."""
+    total = rollup.get("ops_count", 0)
+    successes = rollup.get("success_count", 0)
+    profit = rollup.get("total_profit", 0.0)
+    return {
+        "total_profit": round(profit, 4),
+        "successful_arbs": successes,
+        "avg_profitability": round(profit / successes, 4) if successes else 0.0,
+        "success_rate": round(successes / total, 4) if total else 0.0,
+    }
+
+
+def rollup_group_stage(key) -> dict:
+    """`$group` stage producing rollup sums for ops grouped by `key`."""
+    is_success = {"$eq": ["$status", "success"]}
+    return {
+        "$group": {
+            "_id": key,
+            "ops_count": {"$sum": 1},
+            "success_count": {"$sum": {"$cond": [is_success, 1, 0]}},
+            "total_profit": {"$sum": {"$cond": [is_success, "$profit", 0]}},
+            "total_fees": {"$sum": "$fees"},
+            "exec_time_ms_sum": {"$sum": "$exec_time_ms"},
+        }
+    }
+
+
+def truncate(ts: datetime, granularity: str) -> datetime:
+    ts = as_utc(ts).replace(minute=0, second=0, microsecond=0)
+    return ts.replace(hour=0) if granularity == "day" else ts
+
+
+def _ceil(ts: datetime, granularity: str) -> datetime:
+    floor = truncate(ts, granularity)
+    return floor if floor == ts else floor + BUCKET_STEPS[granularity]
+
+
+def bucket_filters(op: dict) -> list[dict]:
+    """Identity of every bucket (one per granularity) an op contributes to."""
+    return [
+        {
+            "wallet_address": op["wallet_address"],
+            "granularity": granularity,
+            "start": truncate(op["timestamp"], granularity),
+            "pair": op.get("pair", ""),
+            "dex": op.get("dex", ""),
+            "status": op.get("status", ""),
+        }
+        for granularity in BUCKET_STEPS
+    ]
+
+
+def _span(lo: Optional[datetime], hi: Optional[datetime], hi_inclusive: bool = False) -> dict:
+    span: dict = {}
+    if lo is not None:
+        span["$gte"] = lo
+    if hi is not None:
+        span["$lte" if hi_inclusive else "$lt"] = hi
+    return span
+
+
+def plan_range(
+    from_ts: Optional[datetime], to_ts: Optional[datetime]
+) -> tuple[list[tuple[str, dict]], list[dict]]:
+    """Split the inclusive range `[from_ts, to_ts]` into bucket reads and raw op windows.
+
+    Whole days are read from day buckets and whole hours around them from hour
+    buckets; only the partial hours at either edge are left for a raw `ops` scan.
+    Returns `(buckets, raw)` where `buckets` is a list of `(granularity, start span)`
+    and `raw` a list of `timestamp` spans.
+    """
+    from_ts = as_utc(from_ts) if from_ts else None
+    to_ts = as_utc(to_ts) if to_ts else None
+    h0 = _ceil(from_ts, "hour") if from_ts else None
+    h1 = truncate(to_ts, "hour") if to_ts else None
+    if h0 is not None and h1 is not None and h0 >= h1:
+        return [], [_span(from_ts, to_ts, hi_inclusive=True)]
+
+    raw = []
+    if from_ts is not None and from_ts < h0:
+        raw.append(_span(from_ts, h0))
+    if to_ts is not None:
+        raw.append(_span(h1, to_ts, hi_inclusive=True))
+
+    d0 = _ceil(h0, "day") if h0 is not None else None
+    d1 = truncate(h1, "day") if h1 is not None else None
+    if d0 is not None and d1 is not None and d0 >= d1:
+        return [("hour", _span(h0, h1))], raw
+
+    buckets = [("day", _span(d0, d1))]
+    if h0 is not None and h0 < d0:
+        buckets.append(("hour", _span(h0, d0)))
+    if h1 is not None and d1 < h1:
+        buckets.append(("hour", _span(d1, h1)))
+    return buckets, raw
+
+
+# `$group` keys for breakdowns, as (bucket expression, raw op expression).
+GROUP_KEYS = {
+    "pair": ("$pair", "$pair"),
+    "dex": ("$dex", "$dex"),
+    "day": (
+        {"$dateToString": {"format": "%Y-%m-%d", "date": "$start"}},
+        {"$dateToString": {"format": "%Y-%m-%d", "date": "$timestamp"}},
+    ),
+}
+
+
+async def breakdown_range(
+    wallet_address: str,
+    from_ts: Optional[datetime] = None,
+    to_ts: Optional[datetime] = None,
+    pair: Optional[str] = None,
+    dex: Optional[str] = None,
+    group_by: Optional[str] = None,
+) -> dict:
+    """Rollup sums for a filtered date range, keyed by the `group_by` value.
+
+    Buckets and the raw edge windows (see `plan_range`) are each reduced with a
+    server-side `$group`, so at most two small result sets cross the wire.
+    Without `group_by` everything lands under the `None` key.
+    """
+    db = get_db()
+    base: dict = {"wallet_address": wallet_address}
+    if pair:
+        base["pair"] = pair
+    if dex:
+        base["dex"] = dex
+    bucket_key, raw_key = GROUP_KEYS[group_by] if group_by else (None, None)
+
+    buckets, raw = plan_range(from_ts, to_ts)
+    reads = []
+    if buckets:
+        bucket_or = [{"granularity": g, **({"start": span} if span else {})} for g, span in buckets]
+        sum_stage = {"$group": {"_id": bucket_key, **{f: {"$sum": f"${f}"} for f in ROLLUP_FIELDS}}}
+        reads.append(db.op_buckets.aggregate([{"$match": {**base, "$or": bucket_or}}, sum_stage]).to_list(None))
+    if raw:
+        raw_match = {"$match": {**base, "$or": [{"timestamp": span} for span in raw]}}
+        archives = sorted({
+            name
+            for span in raw
+            for name in archive_names_between(span["$gte"], span.get("$lte", span.get("$lt")))
+        })
+        pipeline = [raw_match, *_union_archives(archives, raw_match), rollup_group_stage(raw_key)]
+        reads.append(db.ops.aggregate(pipeline).to_list(None))
+
+    groups: dict = {}
+    for rows in await asyncio.gather(*reads):
+        for row in rows:
+            key = row.pop("_id")
+            merge_increments(groups.setdefault(key, {}), row)
+    return groups
+
+
+# An op's `timestamp` as a date. Ops ingested before timestamps were parsed
+# hold the monitor's raw ISO string or unix seconds; anything else is null.
+_OP_DATE = {
+    "$switch": {
+        "branches": [
+            {"case": {"$eq": [{"$type": "$timestamp"}, "date"]}, "then": "$timestamp"},
+            {
+                "case": {"$eq": [{"$type": "$timestamp"}, "string"]},
+                "then": {"$dateFromString": {"dateString": "$timestamp", "onError": None, "onNull": None}},
+            },
+            {"case": {"$isNumber": "$timestamp"}, "then": {"$toDate": {"$multiply": ["$timestamp", 1000]}}},
+        ],
+        "default": None,
+    }
+}
+
+
+def _bucket_stages(granularity: str) -> list[dict]:
+    """Stages grouping ops into `granularity` buckets, reading legacy timestamps as dates."""
+    return [
+        {"$set": {"timestamp": _OP_DATE}},
+        {"$match": {"timestamp": {"$type": "date"}}},
+        rollup_group_stage({
+            "wallet_address": "$wallet_address",
+            "start": {"$dateTrunc": {"date": "$timestamp", "unit": granularity, "timezone": "UTC"}},
+            "pair": "$pair",
+            "dex": "$dex",
+            "status": "$status",
+        }),
+    ]
+
+
+async def normalize_op_timestamps() -> int:
+    """Rewrite legacy string / unix-seconds `timestamp`s in `ops` and its archives as dates.
+
+    Mixed BSON types sort apart, so until then those ops fall outside date
+    filters and out of order in keyset pages. Values that don't parse are kept.
+    Returns the number of ops rewritten.
+    """
+    db = get_db()
+    legacy = {"timestamp": {"$type": ["string", "number"]}}
+    update = [{"$set": {"timestamp": {"$ifNull": [_OP_DATE, "$timestamp"]}}}]
+    fixed = 0
+    for name in ["ops", *await archive_collections(db)]:
+        result = await db[name].update_many(legacy, update)
+        fixed += result.modified_count
+    return fixed
+
+
+def _union_archives(names: list[str], match: dict) -> list[dict]:
+    """`$unionWith` stages pulling matching ops from archive collections (see core.retention)."""
+    return [{"$unionWith": {"coll": name, "pipeline": [match]}} for name in names]
+
+
+async def rebuild_buckets(wallet_address: str | None = None) -> int:
+    """Recompute `op_buckets` from `ops` and its archives. Returns the number of buckets written.
+
+    Legacy string / unix-seconds timestamps are read as dates; ops whose
+    timestamp doesn't parse are skipped.
+    """
+    db = get_db()
+    scope = {"wallet_address": wallet_address} if wallet_address else {}
+    await db.op_buckets.delete_many(scope)
+    archives = await archive_collections(db)
+
+    written = 0
+    for granularity in BUCKET_STEPS:
+        match = {"$match": scope}
+        pipeline = [match, *_union_archives(archives, match), *_bucket_stages(granularity)]
+        writes: list[InsertOne] = []
+        async for row in db.ops.aggregate(pipeline, allowDiskUse=True):
+            key = row.pop("_id")
+            writes.append(InsertOne({**key, "granularity": granularity, **row, "updated_at": now_utc()}))
+            if len(writes) >= _REBUILD_BATCH:
+                await db.op_buckets.bulk_write(writes, ordered=False)
+                written += len(writes)
+                writes = []
+        if writes:
+            await db.op_buckets.bulk_write(writes, ordered=False)
+            written += len(writes)
+    return written
+
+
+async def rebuild_rollups(wallet_address: str | None = None) -> int:
+    """Recompute rollups from `ops` and its archives. Returns the number of rollups written.
+
+    Increments ingested while the rebuild runs may be overwritten, so run it
+    while the monitor is paused or re-run it afterwards.
+    """
+    db = get_db()
+    match = {"$match": {"wallet_address": wallet_address} if wallet_address else {}}
+    archives = await archive_collections(db)
+    pipeline = [match, *_union_archives(archives, match), rollup_group_stage("$wallet_address")]
+
+    seen: list[str] = []
+    writes: list[ReplaceOne] = []
+    async for row in db.ops.aggregate(pipeline, allowDiskUse=True):
+        wallet = row.pop("_id")
+        seen.append(wallet)
+        writes.append(
+            ReplaceOne(
+                {"wallet_address": wallet},
+                {"wallet_address": wallet, **row, "updated_at": now_utc()},
+                upsert=True,
+            )
+        )
+        if len(writes) >= _REBUILD_BATCH:
+            await db.op_rollups.bulk_write(writes, ordered=False)
+            writes = []
+    if writes:
+        await db.op_rollups.bulk_write(writes, ordered=False)
+
+    stale = {"wallet_address": {"$nin": seen}}
+    if wallet_address:
+        stale = {"wallet_address": wallet_address} if not seen else None
+    if stale is not None:
+        await db.op_rollups.delete_many(stale)
+    return len(seen)
+
+
+async def _backfill_into(collection, pipeline: list[dict], key_of) -> int:
+    """`$inc` each aggregated row into its document once, flagging it `backfilled`.
+
+    A document already flagged doesn't match the filter, and the upsert then hits
+    the collection's unique key, so re-running after a crash never counts twice.
+    """
+    db = get_db()
+    added = 0
+    writes: list[UpdateOne] = []
+
+    async def flush() -> None:
+        nonlocal added, writes
+        try:
+            result = await collection.bulk_write(writes, ordered=False)
+            added += result.modified_count + result.upserted_count
+        except BulkWriteError as exc:
+            if any(err.get("code") != _DUPLICATE_KEY for err in exc.details.get("writeErrors", [])):
+                raise
+            added += exc.details.get("nModified", 0) + exc.details.get("nUpserted", 0)
+        writes = []
+
+    async for row in db.ops.aggregate(pipeline, allowDiskUse=True):
+        key = key_of(row.pop("_id"))
+        writes.append(
+            UpdateOne(
+                {**key, "backfilled": {"$ne": True}},
+                {"$inc": row, "$set": {"backfilled": True, "updated_at": now_utc()}},
+                upsert=True,
+            )
+        )
+        if len(writes) >= _REBUILD_BATCH:
+            await flush()
+    if writes:
+        await flush()
+    return added
+
+
+async def backfill_rollups() -> None:
+    """Add ops stored before rollups existed to `op_rollups` and `op_buckets`, once per database.
+
+    The first start records `since` in the marker; from then on ingest keeps the
+    rollups current, so only ops inserted before it (by `_id`) are added. API
+    workers still running the old code after that are not counted; stop them
+    before upgrading or run `python -m core.rollups rebuild` afterwards. Legacy
+    op timestamps are rewritten as dates first (`normalize_op_timestamps`).
+    """
+    db = get_db()
+    now = now_utc()
+    await db.migrations.update_one({"_id": BACKFILL_MARKER}, {"$setOnInsert": {"since": now}}, upsert=True)
+    marker = await db.migrations.find_one_and_update(
+        {
+            "_id": BACKFILL_MARKER,
+            "done": {"$ne": True},
+            "$or": [{"claimed_at": None}, {"claimed_at": {"$lt": now - _BACKFILL_CLAIM_TTL}}],
+        },
+        {"$set": {"claimed_at": now}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if marker is None:
+        return  # done, or another worker is on it
+
+    normalized = await normalize_op_timestamps()
+    match = {"$match": {"_id": {"$lt": ObjectId.from_datetime(marker["since"])}}}
+    archives = await archive_collections(db)
+    source = [match, *_union_archives(archives, match)]
+    rollups = await _backfill_into(
+        db.op_rollups,
+        [*source, rollup_group_stage("$wallet_address")],
+        lambda wallet: {"wallet_address": wallet},
+    )
+    buckets = 0
+    for granularity in BUCKET_STEPS:
+        buckets += await _backfill_into(
+            db.op_buckets,
+            [*source, *_bucket_stages(granularity)],
+            lambda key, granularity=granularity: {**key, "granularity": granularity},
+        )
+    await db.migrations.update_one(
+        {"_id": BACKFILL_MARKER}, {"$set": {"done": True, "finished_at": now_utc()}}
+    )
+    log.info(
+        "Backfilled %d op rollup(s) and %d op bucket(s) from existing ops (%d legacy timestamp(s) normalized)",
+        rollups, buckets, normalized,
+    )
+
+
+async def _run_backfill() -> None:
+    try:
+        await backfill_rollups()
+    except PyMongoError as exc:
+        log.warning("Op rollup backfill failed, retried on a later start: %s", exc)
+
+
+def start_backfill() -> None:
+    """Run `backfill_rollups` in the background (called at startup)."""
+    global _backfill_task
+    if _backfill_task is None:
+        _backfill_task = asyncio.create_task(_run_backfill())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m core.rollups")
+    commands = parser.add_subparsers(dest="command", required=True)
+    rebuild = commands.add_parser("rebuild", help="Recompute rollups and buckets from the ops collection")
+    rebuild.add_argument("--wallet", help="Only rebuild this wallet address")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    wallet = args.wallet.lower() if args.wallet else None
+
+    async def _rebuild() -> tuple[int, int]:
+        await normalize_op_timestamps()
+        return await rebuild_rollups(wallet), await rebuild_buckets(wallet)
+
+    rollups, buckets = asyncio.run(_rebuild())
+    logging.info("Rebuilt %d op rollup(s) and %d op bucket(s)", rollups, buckets)
+
+
+if __name__ == "__main__":
+    main()
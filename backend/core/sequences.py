@@ -0,0 +1,50 @@
+"""Monotonic sequence numbers for collections read by cursor.
+
+ObjectIds only order inserts within one second of one process, so readers that
+resume "after the last document seen" page on a `seq` taken from a counter
+instead. Numbers are reserved before the insert, so a reader can briefly see
+`n + 1` before `n`; `contiguous` holds a reader at such a gap for a grace
+period instead of skipping past it.
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from pymongo import ReturnDocument
+
+from core.db import get_db
+from core.utils import as_utc, now_utc
+
+# A missing number older than this was reserved by an insert that never landed.
+GAP_GRACE = timedelta(seconds=5)
+
+
+async def reserve_seq(name: str, count: int = 1) -> int:
+    """Reserve `count` consecutive numbers of sequence `name`; returns the first."""
+    counter = await get_db().counters.find_one_and_update(
+        {"_id": name},
+        {"$inc": {"seq": count}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return counter["seq"] - count + 1
+
+
+async def current_seq(name: str) -> int:
+    """The last number handed out by sequence `name` (0 before the first)."""
+    counter = await get_db().counters.find_one({"_id": name})
+    return counter["seq"] if counter else 0
+
+
+def contiguous(docs: list[dict], after: int, time_field: str = "created_at") -> list[dict]:
+    """The leading run of `docs` (sorted by `seq`) that follows `after` without a
+    gap still young enough to be filled by an insert in flight."""
+    cutoff = now_utc() - GAP_GRACE
+    run: list[dict] = []
+    expected = after + 1
+    for doc in docs:
+        if doc["seq"] != expected and as_utc(doc[time_field]) > cutoff:
+            break
+        run.append(doc)
+        expected = doc["seq"] + 1
+    return run
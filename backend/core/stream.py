@@ -0,0 +1,59 @@
+"""Cross-process side of the `/stream` feed (`STREAM_BACKEND=mongo`).
+
+Events are appended to a capped collection that every API worker tails (see
+`api.hub`), so any process — an API worker or the Telegram bot — can publish
+to clients connected anywhere. Each event carries a `seq` so a relay that
+reopens its cursor resumes exactly where it stopped.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from pymongo.errors import CollectionInvalid, PyMongoError
+
+from core.config import get_settings
+from core.db import get_db
+from core.sequences import reserve_seq
+from core.utils import now_utc
+
+log = logging.getLogger(__name__)
+
+STREAM_COLLECTION = "stream_events"
+_STREAM_COLLECTION_BYTES = 16 * 1024 * 1024
+
+
+def stream_message(event_type: str, data: Any) -> dict:
+    return {"type": event_type, "data": jsonable_encoder(data)}
+
+
+def shared_stream() -> bool:
+    return get_settings().stream_backend == "mongo"
+
+
+async def append_stream_events(events: list[tuple[str, str, Any]]) -> None:
+    """Append `(wallet, type, data)` events to the shared stream collection."""
+    if not events:
+        return
+    try:
+        first = await reserve_seq(STREAM_COLLECTION, len(events))
+        docs = [
+            {
+                "seq": first + i,
+                "wallet_address": wallet,
+                "message": stream_message(event_type, data),
+                "created_at": now_utc(),
+            }
+            for i, (wallet, event_type, data) in enumerate(events)
+        ]
+        await get_db()[STREAM_COLLECTION].insert_many(docs, ordered=False)
+    except PyMongoError as exc:
+        log.warning("Stream publish failed: %s", exc)
+
+
+async def ensure_stream_collection(db) -> None:
+    try:
+        await db.create_collection(STREAM_COLLECTION, capped=True, size=_STREAM_COLLECTION_BYTES)
+    except CollectionInvalid:
+        pass  # already exists
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+from core.cache import TTLCache
+from core.db import get_db
+from core.sequences import current_seq, reserve_seq
+
+# Bumped on every Mini App link, so processes holding `_wallets` (the bot runs
+# apart from the API) notice a re-link with one counter read. The counter is
+# read at most every LINKS_CHECK_EVERY seconds, which bounds how long a re-link
+# goes unnoticed.
+LINKS_SEQ = "telegram_links"
+LINKS_CHECK_EVERY = 5
+
+# telegram_user_id -> linked wallet. Only links are cached, so a user who has
+# just connected the Mini App is never told to connect it again. The cache is
+# only trusted while LINKS_SEQ is where it was when the entries were read.
+_wallets = TTLCache(10_000, ttl_seconds=60)
+_links_seen = 0
+_links_checked_at = float("-inf")
+
+
+async def check_links() -> None:
+    """Drop cached links if any Telegram user was linked since the last check."""
+    global _links_seen, _links_checked_at
+    if time.monotonic() - _links_checked_at < LINKS_CHECK_EVERY:
+        return
+    _links_checked_at = time.monotonic()
+    links = await current_seq(LINKS_SEQ)
+    if links != _links_seen:
+        _wallets.clear()
+        _links_seen = links
+
+
+async def wallet_for_user(telegram_user_id: int) -> Optional[str]:
+    await check_links()
+    wallet = _wallets.get(telegram_user_id)
+    if wallet is None:
+        db = get_db()
+        mapping = await db.telegram_users.find_one(
+            {"telegram_user_id": telegram_user_id}, {"_id": 0, "wallet_address": 1}
+        )
+        wallet = mapping.get("wallet_address") if mapping else None
+        if wallet:
+            _wallets.set(telegram_user_id, wallet)
+    return wallet
+
+
+async def link_telegram_user(telegram_user_id: int, wallet_address: str) -> None:
+    """Point a Telegram user at `wallet_address` and invalidate every process's cache."""
+    db = get_db()
+    await db.telegram_users.update_one(
+        {"telegram_user_id": telegram_user_id},
+        {"$set": {"wallet_address": wallet_address}},
+        upsert=True,
+    )
+    # After the write: a reader that saw the old counter re-reads on its next hit.
+    await reserve_seq(LINKS_SEQ)
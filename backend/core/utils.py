@@ -13,5 +13,31 @@ def now_utc() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC and convert aware ones to UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def parse_timestamp(value) -> datetime:
+    """Coerce an event timestamp (datetime, ISO-8601 string or unix seconds) to aware UTC.
+
+    Raises `ValueError` for anything that isn't a valid timestamp.
+    """
+    if value is None:
+        return now_utc()
+    if isinstance(value, datetime):
+        return as_utc(value)
+    if isinstance(value, (int, float)):
+        try:
+            return datetime.fromtimestamp(value, tz=timezone.utc)
+        except (OverflowError, OSError) as exc:
+            raise ValueError(f"Timestamp out of range: {value!r}") from exc
+    if isinstance(value, str):
+        return as_utc(datetime.fromisoformat(value))
+    raise ValueError(f"Unsupported timestamp: {value!r}")
+
+
 def hash_token(token: str) -> str:
     return hashlib.sha256(token.encode("utf-8")).hexdigest()
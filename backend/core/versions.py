@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import logging
+from typing import Iterable
+
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+from core.db import get_db
+
+log = logging.getLogger(__name__)
+
+
+async def bump_versions(wallets: Iterable[str]) -> None:
+    """Advance the data version of each wallet after a write that changes what it polls."""
+    writes = [UpdateOne({"_id": wallet}, {"$inc": {"v": 1}}, upsert=True) for wallet in set(wallets)]
+    if not writes:
+        return
+    try:
+        await get_db().wallet_versions.bulk_write(writes, ordered=False)
+    except PyMongoError as exc:
+        log.warning("Wallet version bump failed: %s", exc)
+
+
+async def get_version(wallet_address: str) -> int:
+    doc = await get_db().wallet_versions.find_one({"_id": wallet_address}, {"v": 1})
+    return doc["v"] if doc else 0
@@ -1,6 +1,7 @@
 /**
  * @typedef {import("./types").ApiError} ApiError
  * @typedef {import("./types").BotStatus} BotStatus
+ * @typedef {import("./types").DeployJob} DeployJob
  * @typedef {import("./types").LoginResponse} LoginResponse
  * @typedef {import("./types").LogEntry} LogEntry
  * @typedef {import("./types").Notification} Notification
@@ -28,6 +29,11 @@ export function setOnUnauthorized(handler) {
   onUnauthorized = handler;
 }
 
+/** URL of the server-push event feed; EventSource can't send headers, so the token rides in the query. */
+export function streamUrl() {
+  return `${API_BASE}/stream?token=${encodeURIComponent(authToken || "")}`;
+}
+
 class ApiClientError extends Error {
   /** @param {ApiError} error */
   constructor(error) {
@@ -147,6 +153,13 @@ export const api = {
       body: JSON.stringify({ ids })
     });
   },
+  async markAllNotifications() {
+    return request("/notifications/read-all", { method: "POST" });
+  },
+  /** @returns {Promise<{ unread: number }>} */
+  async unreadCount() {
+    return request("/notifications/unread-count");
+  },
   /** @returns {Promise<LogEntry[]>} */
   async logs(limit = 12) {
     return request(`/logs/recent?limit=${limit}`);
@@ -169,8 +182,13 @@ export const api = {
       method: "DELETE"
     });
   },
+  /** @returns {Promise<DeployJob>} */
   async deployContract() {
     return request("/deploy/contract", { method: "POST" });
+  },
+  /** @returns {Promise<DeployJob>} */
+  async deployJob(id) {
+    return request(`/deploy/jobs/${id}`);
   }
 };
 
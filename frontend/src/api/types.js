@@ -29,6 +29,7 @@
  *   dex_list: string[],
  *   pairs: string[],
  *   scan_frequency_sec: number,
+ *   opportunity_alert_window_sec: number,
  *   updated_at?: string
  * }} Settings
  */
@@ -79,7 +80,9 @@
  *   type: string,
  *   title: string,
  *   message: string,
- *   read: boolean
+ *   read: boolean,
+ *   count?: number,
+ *   best_profit_pct?: number
  * }} Notification
  */
 
@@ -103,4 +106,19 @@
  * }} Opportunity
  */
 
+/**
+ * @typedef {{
+ *   id: string,
+ *   status: "queued" | "running" | "succeeded" | "failed",
+ *   stage: string,
+ *   stages: { stage: string, at: string }[],
+ *   network: string,
+ *   tx_hash?: string,
+ *   address?: string,
+ *   routers?: { router: string, status: string, tx_hash?: string, error?: string }[],
+ *   old_contract_pause?: { contract: string, status: string, tx_hash?: string, error?: string },
+ *   error?: ApiError
+ * }} DeployJob
+ */
+
 export {};
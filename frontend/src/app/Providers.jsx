@@ -2,11 +2,14 @@ import React from "react";
 import { HashRouter } from "react-router-dom";
 import { AuthProvider } from "../hooks/useAuth";
 import { BotStatusProvider } from "../hooks/useBotStatus";
+import { EventStreamProvider } from "../hooks/useEventStream";
 
 export const Providers = ({ children }) => (
   <HashRouter>
     <AuthProvider>
-      <BotStatusProvider>{children}</BotStatusProvider>
+      <EventStreamProvider>
+        <BotStatusProvider>{children}</BotStatusProvider>
+      </EventStreamProvider>
     </AuthProvider>
   </HashRouter>
 );
@@ -23,7 +23,10 @@ export const NotificationRow = ({ item }) => {
           <span>{item.title}</span>
           {!item.read && <span className="unread-dot" />}
         </div>
-        <div className="notif-row__msg">{item.message}</div>
+        <div className="notif-row__msg">
+          {item.message}
+          {item.count > 1 && ` · ×${item.count}, best ${item.best_profit_pct.toFixed(2)}%`}
+        </div>
       </div>
       <div className="notif-row__time">{timeAgo(item.created_at)}</div>
     </div>
@@ -81,7 +81,7 @@ export const AutoExecuteCard = ({
           className="subcard__cta"
         >
           {deployState?.pending
-            ? "Deploying…"
+            ? `Deploying${deployState.stage ? ` · ${deployState.stage.replace("_", " ")}` : ""}…`
             : settings.flash_loan_contract
             ? "Re-deploy contract"
             : "Deploy contract"}
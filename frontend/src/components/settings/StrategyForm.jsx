@@ -61,6 +61,16 @@ export const StrategyForm = ({ settings, onChange, onSave, notice }) => {
         />
       </Field>
 
+      <Field label="Opportunity alerts">
+        <NumberInput
+          value={settings.opportunity_alert_window_sec}
+          onChange={(v) => patch({ opportunity_alert_window_sec: v })}
+          suffix="sec"
+          step={30}
+          min={0}
+        />
+      </Field>
+
       <PrimaryButton block onClick={onSave}>
         Save strategy
       </PrimaryButton>
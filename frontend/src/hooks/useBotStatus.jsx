@@ -2,14 +2,29 @@ import React, { createContext, useCallback, useContext, useMemo, useState } from
 import { api } from "../api/client";
 import { BOT_STATUS } from "../constants/status";
 import { useAuth } from "./useAuth";
+import { useEventStream, useStreamEvent } from "./useEventStream";
 import { usePolling } from "./usePolling";
 
 const BotStatusContext = createContext(null);
 
 const POLL_MS = 4200;
+// While /stream is connected, polling only reconciles missed updates.
+const STREAM_POLL_MS = 60000;
+
+const applyKpiDelta = (kpis, delta) => {
+  const current_profit = (kpis?.current_profit ?? 0) + (delta.current_profit ?? 0);
+  const completed_deals = (kpis?.completed_deals ?? 0) + (delta.completed_deals ?? 0);
+  return {
+    ...kpis,
+    current_profit,
+    completed_deals,
+    avg_profitability: completed_deals ? current_profit / completed_deals : 0,
+  };
+};
 
 export const BotStatusProvider = ({ children }) => {
   const { token } = useAuth();
+  const { connected } = useEventStream();
   const [status, setStatus] = useState(null);
   const [error, setError] = useState(null);
 
@@ -26,7 +41,12 @@ export const BotStatusProvider = ({ children }) => {
     }
   }, [token]);
 
-  usePolling(refresh, POLL_MS, Boolean(token));
+  usePolling(refresh, connected ? STREAM_POLL_MS : POLL_MS, Boolean(token));
+
+  useStreamEvent("status", (data) => setStatus((prev) => ({ ...prev, ...data })));
+  useStreamEvent("kpis", (delta) =>
+    setStatus((prev) => (prev ? { ...prev, kpis: applyKpiDelta(prev.kpis, delta) } : prev))
+  );
 
   const value = useMemo(
     () => ({
@@ -34,10 +54,11 @@ export const BotStatusProvider = ({ children }) => {
       error,
       refresh,
       setStatus,
+      streaming: connected,
       isActive: status?.status === BOT_STATUS.ACTIVE,
       hasError: Boolean(status?.last_error) || status?.status === BOT_STATUS.ERROR,
     }),
-    [status, error, refresh]
+    [status, error, refresh, connected]
   );
 
   return <BotStatusContext.Provider value={value}>{children}</BotStatusContext.Provider>;
@@ -0,0 +1,73 @@
+import React, { createContext, useCallback, useContext, useEffect, useMemo, useRef, useState } from "react";
+import { streamUrl } from "../api/client";
+import { useAuth } from "./useAuth";
+
+const EventStreamContext = createContext(null);
+
+/** Event types pushed by `GET /stream`. */
+export const STREAM_EVENTS = ["status", "kpis", "notification", "opportunity", "log"];
+
+/**
+ * Holds one EventSource per session and fans its events out to subscribers.
+ * EventSource reconnects on its own; `connected` lets callers fall back to
+ * polling while the stream is down.
+ */
+export const EventStreamProvider = ({ children }) => {
+  const { token } = useAuth();
+  const [connected, setConnected] = useState(false);
+  const listeners = useRef(new Map());
+
+  useEffect(() => {
+    if (!token || typeof EventSource === "undefined") return undefined;
+    const source = new EventSource(streamUrl());
+    source.onopen = () => setConnected(true);
+    source.onerror = () => setConnected(false);
+    STREAM_EVENTS.forEach((type) => {
+      source.addEventListener(type, (event) => {
+        let data;
+        try {
+          data = JSON.parse(event.data);
+        } catch {
+          return;
+        }
+        listeners.current.get(type)?.forEach((handler) => handler(data));
+      });
+    });
+    return () => {
+      source.close();
+      setConnected(false);
+    };
+  }, [token]);
+
+  const subscribe = useCallback((type, handler) => {
+    if (!listeners.current.has(type)) listeners.current.set(type, new Set());
+    listeners.current.get(type).add(handler);
+    return () => listeners.current.get(type).delete(handler);
+  }, []);
+
+  const value = useMemo(() => ({ connected, subscribe }), [connected, subscribe]);
+
+  return <EventStreamContext.Provider value={value}>{children}</EventStreamContext.Provider>;
+};
+
+export function useEventStream() {
+  const ctx = useContext(EventStreamContext);
+  if (!ctx) {
+    throw new Error("useEventStream must be used within EventStreamProvider");
+  }
+  return ctx;
+}
+
+/**
+ * Calls `handler(data)` for every `type` event. The latest handler is held in
+ * a ref so inline functions don't resubscribe on each render.
+ */
+export function useStreamEvent(type, handler) {
+  const { subscribe } = useEventStream();
+  const ref = useRef(handler);
+  useEffect(() => {
+    ref.current = handler;
+  }, [handler]);
+
+  useEffect(() => subscribe(type, (data) => ref.current?.(data)), [subscribe, type]);
+}
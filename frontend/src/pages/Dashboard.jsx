@@ -1,7 +1,8 @@
-import React, { useCallback, useMemo, useState } from "react";
+import React, { useCallback, useState } from "react";
 import { api } from "../api/client";
 import { useAuth } from "../hooks/useAuth";
 import { useBotStatus } from "../hooks/useBotStatus";
+import { useStreamEvent } from "../hooks/useEventStream";
 import { usePolling } from "../hooks/usePolling";
 import { formatNumber, formatPct, formatUsd } from "../utils/format";
 import {
@@ -21,11 +22,15 @@ import {
 } from "../components/dashboard";
 
 const FEED_INTERVAL_MS = 4200;
+const STREAM_FEED_INTERVAL_MS = 60000;
+const OPPORTUNITIES_LIMIT = 4;
 const NOTIFICATIONS_LIMIT = 6;
 const LOGS_LIMIT = 6;
 
 const safe = (promise) => promise.catch(() => null);
 
+const prepend = (item, limit) => (prev) => [item, ...prev.filter((x) => x.id !== item.id)].slice(0, limit);
+
 const KpiRow = ({ status }) => {
   const kpis = status?.kpis;
   return (
@@ -56,34 +61,39 @@ const LivePill = () => (
 
 export default function DashboardPage() {
   const { profile } = useAuth();
-  const { status, refresh, setStatus } = useBotStatus();
+  const { status, refresh, setStatus, streaming } = useBotStatus();
   const [opportunities, setOpportunities] = useState([]);
   const [notifications, setNotifications] = useState([]);
   const [logs, setLogs] = useState([]);
+  const [unread, setUnread] = useState(0);
   const [error, setError] = useState(null);
 
   const loadFeeds = useCallback(async () => {
     try {
-      const [opps, notifs, lg] = await Promise.all([
+      const [opps, notifs, lg, counter] = await Promise.all([
         safe(api.marketOpportunities()),
         safe(api.notifications(NOTIFICATIONS_LIMIT)),
         safe(api.logs(LOGS_LIMIT)),
+        safe(api.unreadCount()),
       ]);
       setOpportunities(opps || []);
       setNotifications(notifs || []);
       setLogs(lg || []);
+      if (counter) setUnread(counter.unread);
       setError(null);
     } catch (err) {
       setError(err?.message || "Failed to load");
     }
   }, []);
 
-  usePolling(loadFeeds, FEED_INTERVAL_MS);
-
-  const unread = useMemo(
-    () => notifications.filter((n) => !n.read).length,
-    [notifications]
-  );
+  // Pushed events update the feeds in place; polling is the fallback while the stream is down.
+  usePolling(loadFeeds, streaming ? STREAM_FEED_INTERVAL_MS : FEED_INTERVAL_MS);
+  useStreamEvent("opportunity", (item) => setOpportunities(prepend(item, OPPORTUNITIES_LIMIT)));
+  useStreamEvent("notification", (item) => {
+    setNotifications(prepend(item, NOTIFICATIONS_LIMIT));
+    if (!item.read) setUnread((n) => n + 1);
+  });
+  useStreamEvent("log", (item) => setLogs(prepend(item, LOGS_LIMIT)));
 
   const startBot = async () => {
     const res = await api.startBot();
@@ -98,10 +108,10 @@ export default function DashboardPage() {
   };
 
   const markAllRead = async () => {
-    const ids = notifications.filter((n) => !n.read && n.id).map((n) => n.id);
-    if (!ids.length) return;
-    await api.markNotifications(ids);
+    if (!unread) return;
+    await api.markAllNotifications();
     setNotifications((prev) => prev.map((n) => ({ ...n, read: true })));
+    setUnread(0);
   };
 
   const errorMessage = status?.last_error || error;
@@ -5,6 +5,9 @@ import { useNotice } from "../hooks/useNotice";
 import { PageHeader, PageSection } from "../components/ui";
 import { AutoExecuteCard, StrategyForm } from "../components/settings";
 
+const DEPLOY_POLL_MS = 3000;
+const wait = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
 export default function SettingsPage() {
   const { data: settings, setData: setSettings, loading } = useApi(api.getSettings);
   const strategyNotice = useNotice();
@@ -50,9 +53,17 @@ export default function SettingsPage() {
     setDeployState({ pending: true });
     keyNotice.clear();
     try {
-      const result = await api.deployContract();
-      setDeployState({ kind: "success", ...result });
-      setSettings({ ...settings, flash_loan_contract: result.address });
+      let job = await api.deployContract();
+      while (job.status === "queued" || job.status === "running") {
+        setDeployState({ pending: true, stage: job.stage });
+        await wait(DEPLOY_POLL_MS);
+        job = await api.deployJob(job.id);
+      }
+      if (job.status === "failed") {
+        throw job.error || new Error("Deploy failed");
+      }
+      setDeployState({ kind: "success", ...job });
+      setSettings({ ...settings, flash_loan_contract: job.address });
     } catch (err) {
       setDeployState({ kind: "error", message: err?.message || "Deploy failed" });
     }